@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+"""Measures chart download throughput against a local fake Billboard.com
+server, which serves the saved chart pages in tests/ for any date.
+
+Each benchmark fetches the same charts in a different way: one at a time,
+with fetch_many() (parsing on its threads, or on a pool of --processes
+processes), and with AsyncChartData (if aiohttp is installed). The
+"poll" benchmark fetches the current chart over and over, so that all but
+the first fetch are answered with 304 Not Modified.
+
+Usage: python benchmarks/bench_fetch.py [--charts N] [--workers N]
+    [--processes N] [--json PATH]
+"""
+
+import argparse
+import asyncio
+import datetime
+import http.server
+import os
+import threading
+import time
+
+import requests
+
+from common import PAGES, availableParsers, readPage, writeResults
+import billboard
+
+BILLBOARD_URL = "https://www.billboard.com"
+
+
+class FakeBillboardHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    etag = '"bench"'
+
+    def do_GET(self):
+        pages = self.server.pages
+        if self.path.startswith("/charts/year-end/"):
+            body = pages["year-end"]
+        elif self.path.count("/") == 2:
+            # The current chart, which supports conditional requests
+            if self.headers.get("If-None-Match") == self.etag:
+                self.send_response(304)
+                self.send_header("ETag", self.etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = pages["weekly"]
+        else:
+            body = pages["weekly"]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def startServer():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FakeBillboardHandler)
+    server.daemon_threads = True
+    server.pages = {
+        "weekly": readPage(PAGES[0][0]).encode("utf-8"),
+        "year-end": readPage(PAGES[-1][0]).encode("utf-8"),
+    }
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, "http://127.0.0.1:%d" % server.server_address[1]
+
+
+class LocalSession(requests.Session):
+    """A requests session that sends Billboard.com requests to `baseUrl`."""
+
+    def __init__(self, baseUrl, poolSize):
+        super(LocalSession, self).__init__()
+        self.baseUrl = baseUrl
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=poolSize
+        )
+        self.mount(baseUrl, adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        url = url.replace(BILLBOARD_URL, self.baseUrl, 1)
+        return super(LocalSession, self).request(method, url, *args, **kwargs)
+
+
+class LocalAsyncSession(object):
+    """Wraps an aiohttp.ClientSession like LocalSession."""
+
+    def __init__(self, session, baseUrl):
+        self._session = session
+        self.baseUrl = baseUrl
+
+    def get(self, url, **kwargs):
+        return self._session.get(url.replace(BILLBOARD_URL, self.baseUrl, 1), **kwargs)
+
+
+def chartDates(count):
+    start = datetime.date(1979, 8, 4)
+    return [
+        (start - datetime.timedelta(weeks=i)).strftime("%Y-%m-%d") for i in range(count)
+    ]
+
+
+def benchmarkSequential(session, dates, parser):
+    for date in dates:
+        billboard.ChartData("hot-100", date=date, session=session, parser=parser)
+
+
+def benchmarkFetchMany(session, dates, parser, workers, processes=None):
+    queries = [("hot-100", date) for date in dates]
+    for result in billboard.fetch_many(
+        queries,
+        max_workers=workers,
+        parse_processes=processes,
+        session=session,
+        parser=parser,
+    ):
+        if result.error is not None:
+            raise result.error
+
+
+def benchmarkAsync(baseUrl, dates, parser, workers):
+    import aiohttp
+
+    async def fetchAll():
+        connector = aiohttp.TCPConnector(limit=workers)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            local = LocalAsyncSession(session, baseUrl)
+            await asyncio.gather(
+                *[
+                    billboard.AsyncChartData.fetch(
+                        "hot-100", date=date, session=local, parser=parser
+                    )
+                    for date in dates
+                ]
+            )
+
+    asyncio.run(fetchAll())
+
+
+def benchmarkPoll(session, count, parser):
+    store = billboard.ValidatorStore()
+    billboard.set_default_validator_store(store)
+    try:
+        for _ in range(count):
+            billboard.ChartData("hot-100", session=session, parser=parser)
+    finally:
+        billboard.set_default_validator_store(billboard.ValidatorStore())
+    assert store.saved == count - 1
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argParser.add_argument("--charts", type=int, default=50)
+    argParser.add_argument("--workers", type=int, default=8)
+    argParser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help="parse processes for the fetch_many+processes benchmark",
+    )
+    argParser.add_argument("--json", metavar="PATH", help="save results as JSON")
+    args = argParser.parse_args()
+
+    server, baseUrl = startServer()
+    session = LocalSession(baseUrl, args.workers)
+    dates = chartDates(args.charts)
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        aiohttp = None
+
+    results = []
+    print("%-30s%-14s%12s%14s" % ("benchmark", "parser", "time", "charts/s"))
+    for parser in availableParsers():
+        benchmarks = [
+            ("sequential", lambda: benchmarkSequential(session, dates, parser)),
+            (
+                "fetch_many",
+                lambda: benchmarkFetchMany(session, dates, parser, args.workers),
+            ),
+            (
+                "fetch_many+processes",
+                lambda: benchmarkFetchMany(
+                    session, dates, parser, args.workers, args.processes
+                ),
+            ),
+            ("poll", lambda: benchmarkPoll(session, len(dates), parser)),
+        ]
+        if aiohttp is not None:
+            benchmarks.append(
+                (
+                    "async",
+                    lambda: benchmarkAsync(baseUrl, dates, parser, args.workers),
+                )
+            )
+        for name, benchmark in benchmarks:
+            startTime = time.perf_counter()
+            benchmark()
+            elapsed = time.perf_counter() - startTime
+            print(
+                "%-30s%-14s%10.2fs%14.1f"
+                % (name, parser, elapsed, len(dates) / elapsed)
+            )
+            results.append(
+                {
+                    "name": "%s/%s" % (name, parser),
+                    "time": elapsed,
+                    "chartsPerSecond": len(dates) / elapsed,
+                }
+            )
+
+    server.shutdown()
+    if args.json:
+        writeResults(args.json, "fetch", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Times how long `import billboard` takes in a fresh interpreter, and checks
+that it doesn't import the modules that are only needed to fetch or parse
+charts.
+
+Each scenario runs in its own Python process, after a warm-up run that
+compiles the bytecode, and the median of the runs is reported. "time" is the
+time taken by the scenario's statements and "modules" is the number of
+modules they imported. Exits with status 1 if `import billboard` imports
+any of the HEAVY_MODULES.
+
+Usage: python benchmarks/bench_import.py [--repeat N] [--json PATH]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from common import rootDir, writeResults
+
+# Modules that `import billboard` alone must not import
+HEAVY_MODULES = [
+    "aiohttp",
+    "bs4",
+    "lxml",
+    "numpy",
+    "pyarrow",
+    "requests",
+    "selectolax",
+    "sqlite3",
+    "urllib3",
+]
+
+# (name, statements to time after the interpreter has started)
+SCENARIOS = [
+    ("import billboard", "import billboard"),
+    (
+        "import billboard, make_session()",
+        "import billboard; billboard.make_session()",
+    ),
+    (
+        "import billboard, parse",
+        "import billboard; billboard.ChartData('hot-100', fetch=False)"
+        "._parseHtml('<html></html>')",
+    ),
+]
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, %r)
+before = set(sys.modules)
+startTime = time.perf_counter()
+%s
+elapsed = time.perf_counter() - startTime
+imported = sorted(set(sys.modules) - before)
+print(json.dumps({"time": elapsed, "imported": imported}))
+"""
+
+
+def runScenario(statements, env):
+    output = subprocess.check_output(
+        [sys.executable, "-c", CHILD % (rootDir, statements)], env=env
+    )
+    return json.loads(output.decode("utf-8"))
+
+
+def benchmarkScenario(statements, repeat, env):
+    runScenario(statements, env)
+    runs = [runScenario(statements, env) for _ in range(repeat)]
+    return {
+        "time": statistics.median(run["time"] for run in runs),
+        "modules": statistics.median(len(run["imported"]) for run in runs),
+    }, runs[-1]["imported"]
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argParser.add_argument("--repeat", type=int, default=15)
+    argParser.add_argument("--json", metavar="PATH", help="save results as JSON")
+    args = argParser.parse_args()
+
+    # Keep the bytecode out of the source tree, but do use it, since that's
+    # what an installed copy of billboard.py does
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=tempfile.mkdtemp())
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    results = []
+    heavy = []
+    print("%-36s%10s%10s" % ("scenario", "time", "modules"))
+    for name, statements in SCENARIOS:
+        result, imported = benchmarkScenario(statements, args.repeat, env)
+        print("%-36s%8.1fms%10d" % (name, result["time"] * 1000, result["modules"]))
+        if statements == "import billboard":
+            heavy = [module for module in HEAVY_MODULES if module in imported]
+        result["name"] = name
+        results.append(result)
+
+    if args.json:
+        writeResults(args.json, "import", results)
+    if heavy:
+        sys.exit("`import billboard` imported %s" % ", ".join(heavy))
+
+
+if __name__ == "__main__":
+    main()
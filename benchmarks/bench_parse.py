@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Times how long ChartData takes to parse the saved chart pages in tests/,
+with each available HTML parser, and how much memory parsing needs.
+
+For each page, "total" is the whole of ChartData._parseHtml(), "tree" is
+building the document tree, "page" is _parsePage() on that tree (or
+_parseChartPage(), for selectolax) and "rows" is _parseNewStylePage() or
+_parseYearEndPage() alone. "peak" is the peak memory allocated while
+parsing, as measured by tracemalloc (which only sees memory allocated by
+Python, not by C libraries such as lexbor).
+
+Usage: python benchmarks/bench_parse.py [--repeat N] [--json PATH]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from common import PAGES, availableParsers, readPage, writeResults
+import billboard
+
+
+def bestTime(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def benchmarkPage(html, name, date, year, parser, repeat):
+    def newChart():
+        return billboard.ChartData(
+            name, date=date, year=year, fetch=False, parser=parser
+        )
+
+    if parser == "selectolax":
+
+        def buildTree():
+            return billboard._selectolaxTree(html)
+
+        def parsePage():
+            newChart()._parseChartPage(billboard._SelectolaxPage(tree))
+
+        pageClass = billboard._SelectolaxPage
+    else:
+
+        def buildTree():
+            strainer = billboard._chartRegionStrainer()
+            return BeautifulSoup(html, parser, parse_only=strainer)
+
+        def parsePage():
+            newChart()._parsePage(tree)
+
+        pageClass = billboard._SoupPage
+
+    tree = buildTree()
+    page = pageClass(tree)
+
+    def parseRows():
+        chart = newChart()
+        if year:
+            chart._parseYearEndPage(page)
+        else:
+            chart._parseNewStylePage(page)
+
+    def parseAll():
+        newChart()._parseHtml(html)
+
+    tracemalloc.start()
+    parseAll()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "total": bestTime(parseAll, repeat),
+        "tree": bestTime(buildTree, repeat),
+        "page": bestTime(parsePage, repeat),
+        "rows": bestTime(parseRows, repeat),
+        "peak": peak,
+    }
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argParser.add_argument("--repeat", type=int, default=5)
+    argParser.add_argument("--json", metavar="PATH", help="save results as JSON")
+    args = argParser.parse_args()
+
+    results = []
+    print(
+        "%-42s%-14s%10s%10s%10s%10s%10s"
+        % ("page", "parser", "total", "tree", "page", "rows", "peak")
+    )
+    for filename, name, date, year in PAGES:
+        html = readPage(filename)
+        for parser in availableParsers():
+            result = benchmarkPage(html, name, date, year, parser, args.repeat)
+            print(
+                "%-42s%-14s%8.1fms%8.1fms%8.1fms%8.1fms%8.1fMB"
+                % (
+                    filename,
+                    parser,
+                    result["total"] * 1000,
+                    result["tree"] * 1000,
+                    result["page"] * 1000,
+                    result["rows"] * 1000,
+                    result["peak"] / 1e6,
+                )
+            )
+            result["name"] = "%s/%s" % (filename, parser)
+            results.append(result)
+
+    if args.json:
+        writeResults(args.json, "parse", results)
+
+
+if __name__ == "__main__":
+    main()
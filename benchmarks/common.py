@@ -0,0 +1,76 @@
+"""Helpers shared by the benchmark scripts."""
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+rootDir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, rootDir)
+
+import billboard  # noqa: E402
+
+# (HTML fixture, chart name, date, year)
+PAGES = [
+    ("1979-08-04-hot-100.html", "hot-100", "1979-08-04", None),
+    (
+        "2006-08-05-traditional-jazz-albums.html",
+        "traditional-jazz-albums",
+        "2006-08-05",
+        None,
+    ),
+    ("2014-08-02-artist-100.html", "artist-100", "2014-08-02", None),
+    ("2019-hot-100-songs-year-end.html", "hot-100-songs", None, "2019"),
+]
+
+
+def readPage(filename):
+    with open(os.path.join(rootDir, "tests", filename)) as f:
+        return f.read()
+
+
+def availableParsers():
+    for parser in billboard.PARSERS:
+        try:
+            billboard.ChartData("hot-100", fetch=False, parser=parser)._parseHtml(
+                "<html></html>"
+            )
+        except ImportError:
+            continue
+        except Exception:
+            pass
+        yield parser
+
+
+def environment():
+    """Describes the machine and code being benchmarked, so that saved
+    results can be told apart.
+    """
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=rootDir, stderr=subprocess.DEVNULL
+        )
+        commit = commit.decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def writeResults(path, benchmark, results):
+    """Saves results as JSON, for comparing with benchmarks/compare.py.
+
+    Each result is a dict with a unique "name" and any number of numeric
+    measurements.
+    """
+    document = {"benchmark": benchmark, "environment": environment()}
+    document["results"] = results
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
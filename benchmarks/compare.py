@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Compares two benchmark results saved with --json, e.g. from the last
+release and from the current code, and lists the measurements that changed.
+
+Exits with status 1 if any measurement got worse by more than the
+threshold.
+
+Usage: python benchmarks/compare.py OLD.json NEW.json [--threshold PERCENT]
+"""
+
+import argparse
+import json
+import sys
+
+# Measurements for which a bigger number is an improvement
+HIGHER_IS_BETTER = set(["chartsPerSecond"])
+
+
+def loadResults(path):
+    with open(path) as f:
+        document = json.load(f)
+    return document, dict((result["name"], result) for result in document["results"])
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argParser.add_argument("old")
+    argParser.add_argument("new")
+    argParser.add_argument("--threshold", type=float, default=10.0)
+    args = argParser.parse_args()
+
+    oldDocument, oldResults = loadResults(args.old)
+    newDocument, newResults = loadResults(args.new)
+    if oldDocument["benchmark"] != newDocument["benchmark"]:
+        sys.exit(
+            "Can't compare %s results with %s results"
+            % (oldDocument["benchmark"], newDocument["benchmark"])
+        )
+
+    regressions = 0
+    print("%-48s%-16s%14s%14s%10s" % ("name", "measurement", "old", "new", "change"))
+    for name in sorted(set(oldResults) & set(newResults)):
+        for key in sorted(newResults[name]):
+            old, new = oldResults[name].get(key), newResults[name][key]
+            if key == "name" or not old or not isinstance(new, (int, float)):
+                continue
+            change = (new - old) * 100.0 / old
+            worse = -change if key in HIGHER_IS_BETTER else change
+            flag = ""
+            if worse > args.threshold:
+                flag = "  worse"
+                regressions += 1
+            elif worse < -args.threshold:
+                flag = "  better"
+            print(
+                "%-48s%-16s%14.6g%14.6g%+9.1f%%%s" % (name, key, old, new, change, flag)
+            )
+
+    for name in sorted(set(oldResults) ^ set(newResults)):
+        print(
+            "%-48s(only in %s)" % (name, args.old if name in oldResults else args.new)
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
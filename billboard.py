@@ -1,13 +1,33 @@
 #!/usr/bin/env python
 
+import argparse
+import array
+import asyncio
+import bisect
+import collections
+import concurrent.futures
 import datetime
+import email.utils
+import functools
+import heapq
+import http.client
+import importlib
+import itertools
 import json
+import multiprocessing
+import os
+import random
 import re
+import struct
 import sys
+import tempfile
+import threading
+import time
+import unicodedata
 import warnings
-
-from bs4 import BeautifulSoup
-import requests
+import weakref
+from collections.abc import Sequence
+from urllib.parse import quote
 
 """billboard.py: Unofficial Python API for accessing music charts from Billboard.com."""
 
@@ -17,6 +37,30 @@ __maintainer__ = "Allen Guo"
 __email__ = "guoguo12@gmail.com"
 
 
+class _LazyModule(object):
+    """Stands in for a module that is only imported when one of its
+    attributes is first used.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+    def __repr__(self):
+        return "<lazily imported module %r>" % self._name
+
+
+# Beautiful Soup, requests and SQLite are imported the first time a chart is
+# fetched, parsed or cached, so that importing this module stays fast for
+# code that only loads saved charts.
+bs4 = _LazyModule("bs4")
+requests = _LazyModule("requests")
+sqlite3 = _LazyModule("sqlite3")
+urllib3 = _LazyModule("urllib3")
+
+
 # css selector constants
 _CHART_NAME_SELECTOR = 'meta[property="og:title"]'
 _DATE_ELEMENT_SELECTOR = "button.chart-detail-header__date-selector-button"
@@ -30,6 +74,17 @@ _ENTRY_RANK_ATTR = "data-rank"
 # On new style pages, the column headings of chart data
 # Used to determine if the "Award" column is present in the chart.
 _CHART_HEADER_CELLS = "div.o-chart-results-list-header__item span"
+_CHART_DATE_SELECTOR = "#chart-date-picker"
+_ENTRY_ROW_SELECTOR = "ul.o-chart-results-list-row"
+_ENTRY_ROW_TITLE_SELECTOR = "#title-of-a-story"
+_ENTRY_ROW_ARTIST_SELECTOR = "#title-of-a-story + span.c-label"
+_ENTRY_ROW_IMAGE_SELECTOR = "li:nth-child(2) img"
+_YEAR_END_NAV_SELECTOR = "div.a-chart-o-nav-left ul li"
+
+# Parsers accepted by the `parser` argument of ChartData. "html.parser" and
+# "lxml" are BeautifulSoup tree builders; "selectolax" uses a separate,
+# much faster extractor built on selectolax's Lexbor backend.
+PARSERS = ("html.parser", "lxml", "selectolax")
 
 # constants for the getMinistatsCellValue helper function
 _MINISTATS_CELL = "div.chart-list-item__ministats-cell"
@@ -68,6 +123,19 @@ class ChartEntry:
         isNew: Whether the track is new to the chart, as a boolean.
     """
 
+    # Entries are kept by the thousands, so they have no per-instance __dict__
+    __slots__ = (
+        "title",
+        "artist",
+        "image",
+        "peakPos",
+        "lastPos",
+        "weeks",
+        "rank",
+        "isNew",
+    )
+    _FIELDS = __slots__
+
     def __init__(self, title, artist, image, peakPos, lastPos, weeks, rank, isNew):
         self.title = title
         self.artist = artist
@@ -99,7 +167,17 @@ class ChartEntry:
         """Returns the entry as a JSON string.
         This is useful for caching.
         """
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+        return json.dumps(self._toDict(), sort_keys=True, indent=4)
+
+    def _toDict(self):
+        return {field: getattr(self, field) for field in self._FIELDS}
+
+    @classmethod
+    def _fromDict(cls, data):
+        entry = cls.__new__(cls)
+        for field in cls._FIELDS:
+            setattr(entry, field, data[field])
+        return entry
 
 
 class YearEndChartEntry(ChartEntry):
@@ -115,6 +193,9 @@ class YearEndChartEntry(ChartEntry):
         year: The chart's year, as an int.
     """
 
+    __slots__ = ()
+    _FIELDS = ("title", "artist", "image", "rank")
+
     def __init__(self, title, artist, image, rank):
         self.title = title
         self.artist = artist
@@ -122,6 +203,100 @@ class YearEndChartEntry(ChartEntry):
         self.rank = rank
 
 
+class ChartEntryColumns(Sequence):
+    """A compact, column-oriented store for the entries of a chart.
+
+    Numbers are kept in parallel arrays and titles and artists are interned,
+    so that an entry costs a few dozen bytes instead of a full object. The
+    store behaves like a read-only list of entries: indexing it builds a
+    ChartEntry (or YearEndChartEntry) on demand. Changes made to such an
+    entry are not written back to the store.
+    """
+
+    # Stands in for None in the integer columns
+    _NONE = -1
+
+    def __init__(self, yearEnd=False):
+        self.yearEnd = yearEnd
+        self.titles = []
+        self.artists = []
+        self.images = []
+        self.ranks = array.array("i")
+        self.peakPositions = array.array("i")
+        self.lastPositions = array.array("i")
+        self.weeks = array.array("i")
+        self.isNew = bytearray()
+
+    def _pack(self, value):
+        return self._NONE if value is None else value
+
+    def _unpack(self, value):
+        return None if value == self._NONE else value
+
+    def append(self, entry):
+        """Adds a ChartEntry (or YearEndChartEntry) to the end of the store."""
+        self.titles.append(_intern(entry.title))
+        self.artists.append(_intern(entry.artist))
+        self.images.append(entry.image)
+        self.ranks.append(self._pack(entry.rank))
+        if not self.yearEnd:
+            self.peakPositions.append(self._pack(entry.peakPos))
+            self.lastPositions.append(self._pack(entry.lastPos))
+            self.weeks.append(self._pack(entry.weeks))
+            self.isNew.append(1 if entry.isNew else 0)
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chart entry index out of range")
+        rank = self._unpack(self.ranks[index])
+        if self.yearEnd:
+            return YearEndChartEntry(
+                self.titles[index], self.artists[index], self.images[index], rank
+            )
+        return ChartEntry(
+            self.titles[index],
+            self.artists[index],
+            self.images[index],
+            self._unpack(self.peakPositions[index]),
+            self._unpack(self.lastPositions[index]),
+            self._unpack(self.weeks[index]),
+            rank,
+            bool(self.isNew[index]),
+        )
+
+    def __repr__(self):
+        return "{}.{}({!r})".format(
+            self.__class__.__module__, self.__class__.__name__, list(self)
+        )
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# The state of a fetch between ChartData._beginFetch() and _finishFetch()
+_PendingFetch = collections.namedtuple(
+    "_PendingFetch",
+    [
+        "startTime",
+        "calendar",
+        "originalDate",
+        "cache",
+        "requestedDate",
+        "url",
+        "store",
+        "validated",
+    ],
+)
+
+
 class ChartData:
     """Represents a particular Billboard chart for a particular date.
 
@@ -133,10 +308,54 @@ class ChartData:
         nextDate: Deprecated. Is always None or an empty string.
         entries: A list of ChartEntry objects, ordered by position on the chart
             (highest first).
+        stats: A FetchStats describing the last fetchEntries() call, or None
+            if stats are not collected.
     """
 
+    # Attributes that configure how a chart is fetched, rather than describe
+    # the chart itself. These are left out of json() and cache payloads.
+    _TRANSIENT_ATTRS = (
+        "_cache",
+        "_calendar",
+        "_session",
+        "_parser",
+        "_partialParse",
+        "_collectStats",
+        "_parsePool",
+        "_lazyArgs",
+        "_lazyLock",
+        "stats",
+    )
+
+    # The attributes that a lazy chart fetches itself to provide
+    _LAZY_ATTRS = frozenset(
+        [
+            "entries",
+            "title",
+            "date",
+            "previousDate",
+            "nextDate",
+            "previousYear",
+            "nextYear",
+        ]
+    )
+
     def __init__(
-        self, name, date=None, year=None, fetch=True, max_retries=5, timeout=25
+        self,
+        name,
+        date=None,
+        year=None,
+        fetch=True,
+        max_retries=5,
+        timeout=25,
+        cache=None,
+        session=None,
+        parser=None,
+        partial_parse=True,
+        columnar=False,
+        collect_stats=False,
+        lazy=False,
+        calendar=None,
     ):
         """Constructs a new ChartData instance.
 
@@ -161,6 +380,36 @@ class ChartData:
                 (default: 5).
             timeout: The number of seconds to wait for a server response.
                 If None, no timeout is applied.
+            cache: A ChartCache consulted by fetchEntries() before going to
+                Billboard.com. If None, the module-wide cache set with
+                set_default_cache() (if any) is used. If False, no cache is
+                used.
+            session: The requests.Session to fetch with. By default, a
+                connection-pooled session shared by all ChartData instances
+                with the same `max_retries` is used (see configure_session()).
+            parser: The HTML parser to use, one of PARSERS. If None, the
+                module-wide parser set with set_default_parser() is used
+                (by default, "html.parser"). All parsers give identical results.
+            partial_parse: Whether BeautifulSoup should only build the parts
+                of the page that hold chart data, which is faster and uses
+                less memory. (Old-style pages then lose their deprecated
+                `previousDate` and `nextDate`.)
+            columnar: Whether to keep the entries in a compact ChartEntryColumns
+                store instead of a list of ChartEntry objects. This saves a
+                lot of memory when many charts are held at once.
+            collect_stats: Whether fetchEntries() should record a FetchStats
+                in the `stats` attribute. This is also done whenever a stats
+                observer is registered (see add_stats_observer()).
+            lazy: Whether to wait to fetch the chart until its entries,
+                title or date are first read (including by len() and
+                indexing). The chart is then fetched exactly once, even if
+                several threads read it at the same time. This makes it cheap
+                to create many charts that may never be read. Overrides
+                `fetch`.
+            calendar: A PublicationCalendar that replaces `date` with the
+                canonical date of its week before fetching (and caching),
+                and learns from the fetched chart. If None, the module-wide
+                calendar set with set_default_calendar() (if any) is used.
         """
         self.name = name
 
@@ -186,18 +435,74 @@ class ChartData:
 
         self._max_retries = max_retries
         self._timeout = timeout
-
-        self.entries = []
-        if fetch:
+        self._cache = cache
+        self._calendar = calendar
+        self._session = session
+        if parser is not None and parser not in PARSERS:
+            raise ValueError("parser must be one of %s" % ", ".join(PARSERS))
+        self._parser = parser
+        self._partialParse = partial_parse
+        self._collectStats = collect_stats
+        self._parsePool = None
+        self.stats = None
+
+        self.entries = self._newEntries(columnar)
+        if lazy:
+            # Leave the chart's data unset, so that reading it goes through
+            # __getattr__()
+            self._lazyArgs = (self.date, columnar)
+            del self.date, self.title, self.entries
+            self._lazyLock = threading.Lock()
+        elif fetch:
             self.fetchEntries()
 
+    def _newEntries(self, columnar):
+        return ChartEntryColumns(yearEnd=bool(self.year)) if columnar else []
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set, such as the data of a
+        # lazy chart that has not been fetched yet
+        if name in self._LAZY_ATTRS and "_lazyLock" in self.__dict__:
+            self._fetchLazily()
+            return getattr(self, name)
+        raise AttributeError(
+            "%r object has no attribute %r" % (self.__class__.__name__, name)
+        )
+
+    def _fetchLazily(self):
+        """Fetches a lazy chart, unless it has been fetched already."""
+        lock = self.__dict__.get("_lazyLock")
+        if lock is None:
+            return
+        with lock:
+            if "_lazyLock" not in self.__dict__:
+                # Another thread fetched the chart while this one waited
+                return
+            # Fetch into a copy, so that other threads never see a partly
+            # fetched chart, and a failed fetch can be retried
+            chart = object.__new__(self.__class__)
+            chart.__dict__.update(self.__dict__)
+            del chart._lazyArgs, chart._lazyLock
+            date, columnar = self._lazyArgs
+            chart.date = date
+            chart.title = ""
+            chart.entries = chart._newEntries(columnar)
+            chart.fetchEntries()
+            self.__dict__.update(chart.__dict__)
+            del self._lazyArgs, self._lazyLock
+
     def __repr__(self):
         if self.year:
             return "{}.{}({!r}, year={!r})".format(
                 self.__class__.__module__, self.__class__.__name__, self.name, self.year
             )
+        # Don't fetch a lazy chart just to show it
+        if "_lazyArgs" in self.__dict__:
+            date = self._lazyArgs[0]
+        else:
+            date = self.date
         return "{}.{}({!r}, date={!r})".format(
-            self.__class__.__module__, self.__class__.__name__, self.name, self.date
+            self.__class__.__module__, self.__class__.__name__, self.name, date
         )
 
     def __str__(self):
@@ -229,7 +534,67 @@ class ChartData:
         """Returns the entry as a JSON string.
         This is useful for caching.
         """
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+        return json.dumps(self._toDict(), sort_keys=True, indent=4)
+
+    def _toDict(self):
+        self._fetchLazily()
+        data = {
+            key: value
+            for key, value in self.__dict__.items()
+            if key not in self._TRANSIENT_ATTRS
+        }
+        data["entries"] = [entry._toDict() for entry in self.entries]
+        return data
+
+    def _loadAttrs(self, data):
+        for key, value in data.items():
+            # Private attributes hold this instance's own fetch settings
+            if key != "entries" and not key.startswith("_"):
+                setattr(self, key, value)
+
+    def _loadDict(self, data):
+        self._loadAttrs(data)
+        entryClass = YearEndChartEntry if self.year else ChartEntry
+        for entryData in data["entries"]:
+            self.entries.append(entryClass._fromDict(entryData))
+
+    def _loadBytes(self, payload):
+        attrs, entries = _decodeChart(payload)
+        self._loadAttrs(attrs)
+        for entry in entries:
+            self.entries.append(entry)
+
+    def to_bytes(self):
+        """Returns the chart in a compact binary format, which is much smaller
+        and faster to load than json(). Use ChartData.from_bytes() to load it.
+        """
+        return _encodeChart(self)
+
+    @classmethod
+    def from_json(cls, s, **kwargs):
+        """Returns the chart stored in a JSON string, as returned by json().
+
+        Any keyword arguments (e.g. `columnar`) are passed on to the
+        constructor. The chart is not fetched.
+        """
+        data = json.loads(s)
+        chart = cls(data["name"], year=data.get("year"), fetch=False, **kwargs)
+        chart._loadDict(data)
+        return chart
+
+    @classmethod
+    def from_bytes(cls, payload, **kwargs):
+        """Returns the chart stored in bytes returned by to_bytes().
+
+        Any keyword arguments (e.g. `columnar`) are passed on to the
+        constructor. The chart is not fetched.
+        """
+        attrs, entries = _decodeChart(payload)
+        chart = cls(attrs["name"], year=attrs.get("year"), fetch=False, **kwargs)
+        chart._loadAttrs(attrs)
+        for entry in entries:
+            chart.entries.append(entry)
+        return chart
 
     # TODO: As of 2021-11-20, this doesn't seem to be used anymore, since
     # Billboard has made their styling consistent across charts.
@@ -317,17 +682,10 @@ class ChartData:
             )
             self.entries.append(entry)
 
-    def _pageHasAwardColumn(self, soup):
-        cols = soup.select(_CHART_HEADER_CELLS)
-        for span in cols:
-            if "award" in span.string.lower():
-                return True
-        return False
-
-    def _parseNewStylePage(self, soup):
-        dateElement = soup.select_one("#chart-date-picker")
-        if dateElement:
-            self.date = dateElement["data-date"]
+    def _parseNewStylePage(self, page):
+        date = page.chartDate()
+        if date:
+            self.date = date
 
         # TODO: Fix these, if possible. These used to be exposed directly in the
         # HTML. There were tests for these, removed in
@@ -336,83 +694,37 @@ class ChartData:
         self.previousDate = None
         self.nextDate = None
 
-        for entrySoup in soup.select("ul.o-chart-results-list-row"):
-
-            def getEntryAttr(which_li, selector):
-                element = entrySoup.select("li")[which_li].select_one(selector)
-                if element:
-                    return element.text.strip()
-                return None
-
-            try:
-                title = getEntryAttr(3, "#title-of-a-story")
-            except:
-                message = "Failed to parse title"
-                raise BillboardParseException(message)
-
-            try:
-                artist = getEntryAttr(3, "#title-of-a-story + span.c-label") or ""
-            except:
-                message = "Failed to parse artist"
-                raise BillboardParseException(message)
+        # The column layout is the same for every row, so work it out once
+        columns = _columnMap(page.headerTexts())
+        for row in page.rows():
+            title, artist = row.title, row.artist or ""
 
             # For artist charts like the Artist 100
             if artist == "":
                 title, artist = artist, title
 
-            imageElement = entrySoup.select_one("li:nth-child(2) img")
-            if imageElement:
-                image = imageElement.get("data-lazy-src", None)
-            else:
-                image = None
-
             try:
-                rank = int(getEntryAttr(0, "span.c-label"))
+                rank = int(row.rank)
             except:
                 message = "Failed to parse rank"
                 raise BillboardParseException(message)
 
-            def getMeta(attribute, which_li, ifNoValue=None):
-                try:
-                    selected = entrySoup.select_one("ul").select("li")[which_li]
-
-                    if not selected:
-                        return ifNoValue
-
-                    value = selected.text.strip()
-                    if value == "-":
-                        return ifNoValue
-                    else:
-                        return int(value)
-                except:
-                    message = "Failed to parse metadata value: %s" % attribute
-                    raise BillboardParseException(message)
-
-            # Some pages do not show an award column in their chart data.
-            # If missing, this changes the column number offsets.
-            awardColumnOffset = 0 if self._pageHasAwardColumn(soup) else -1
             if self.date:
-                peakPos = getMeta("peak", 4 + awardColumnOffset)
-                lastPos = getMeta("last", 3 + awardColumnOffset, ifNoValue=0)
-                weeks = getMeta("week", 5 + awardColumnOffset, ifNoValue=1)
+                peakPos = _cellValue(row.cells, columns.peak, "peak")
+                lastPos = _cellValue(row.cells, columns.last, "last", ifNoValue=0)
+                weeks = _cellValue(row.cells, columns.weeks, "week", ifNoValue=1)
                 isNew = True if weeks == 1 else False
             else:
                 peakPos = lastPos = weeks = None
                 isNew = False
 
             entry = ChartEntry(
-                title, artist, image, peakPos, lastPos, weeks, rank, isNew
+                title, artist, row.image, peakPos, lastPos, weeks, rank, isNew
             )
             self.entries.append(entry)
 
-    def _parseYearEndPage(self, soup):
-        # This is for consistency with Billboard.com's former title style
-        self.title += " - Year-End"
-
+    def _setYearNavigation(self, years):
         # Determine the next and previous year-end chart
-        years = [
-            int(li.text.strip()) for li in soup.select("div.a-chart-o-nav-left ul li")
-        ]
         current_year = int(self.year)
         min_year, max_year = min(years), max(years)
         if current_year in years:
@@ -441,73 +753,2883 @@ class ChartData:
             else:
                 self.previousYear = self.nextYear = None
 
-        # TODO: This is all copied from `_parseNewStylePage` above, but with
-        # worse error-handling. They should be merged.
-        for entrySoup in soup.select("ul.o-chart-results-list-row"):
+    def _parseYearEndPage(self, page):
+        # This is for consistency with Billboard.com's former title style
+        self.title += " - Year-End"
 
-            def getEntryAttr(which_li, selector):
-                element = entrySoup.select("li")[which_li].select_one(selector)
-                if element:
-                    return element.text.strip()
-                return None
+        self._setYearNavigation([int(year) for year in page.years()])
 
-            title = getEntryAttr(3, "#title-of-a-story")
-            artist = getEntryAttr(3, "#title-of-a-story + span.c-label") or ""
+        for row in page.rows():
+            title, artist = row.title, row.artist or ""
             if artist == "":
                 title, artist = artist, title
-            image = None
-            rank = int(getEntryAttr(0, "span.c-label"))
 
-            entry = YearEndChartEntry(title, artist, image, rank)
+            try:
+                rank = int(row.rank)
+            except:
+                message = "Failed to parse rank"
+                raise BillboardParseException(message)
+
+            entry = YearEndChartEntry(title, artist, None, rank)
             self.entries.append(entry)
 
-    def _parsePage(self, soup):
-        chartTitleElement = soup.select_one(_CHART_NAME_SELECTOR)
-        if chartTitleElement:
-            self.title = re.sub(
-                " Chart$",
-                "",
-                chartTitleElement.get("content", "").split("|")[0].strip(),
-            )
+    def _parseChartPage(self, page):
+        chartTitle = page.chartTitle()
+        if chartTitle is not None:
+            self.title = re.sub(" Chart$", "", chartTitle.split("|")[0].strip())
 
         if self.year:
-            self._parseYearEndPage(soup)
-        elif soup.select("table"):
+            self._parseYearEndPage(page)
+        else:
+            self._parseNewStylePage(page)
+
+    def _parsePage(self, soup):
+        if not self.year and soup.select("table"):
+            chartTitleElement = soup.select_one(_CHART_NAME_SELECTOR)
+            if chartTitleElement:
+                self.title = re.sub(
+                    " Chart$",
+                    "",
+                    chartTitleElement.get("content", "").split("|")[0].strip(),
+                )
             self._parseOldStylePage(soup)
         else:
-            self._parseNewStylePage(soup)
+            self._parseChartPage(_SoupPage(soup))
+
+    def _url(self):
+        if not self.date:
+            if not self.year:
+                # Fetch latest chart
+                return "https://www.billboard.com/charts/%s" % (self.name)
+            return "https://www.billboard.com/charts/year-end/%s/%s" % (
+                self.year,
+                self.name,
+            )
+        return "https://www.billboard.com/charts/%s/%s" % (self.name, self.date)
+
+    def _getCache(self):
+        if self._cache is False:
+            return None
+        return self._cache if self._cache is not None else _defaultCache
+
+    def _loadFromCache(self, cache):
+        payload = cache.get(self.name, date=self.date, year=self.year)
+        if payload is None:
+            return False
+        self._loadBytes(payload)
+        return True
+
+    def _storeInCache(self, cache, requestedDate):
+        if not self.entries:
+            # An empty chart (for an invalid date, or a page that couldn't be
+            # parsed) would otherwise be kept forever
+            return
+        data = self.to_bytes()
+        # A date after the newest chart gives that chart until a new one is
+        # published, so only keep it under a date it will always be given for
+        if self.year or requestedDate is None or self.date >= str(requestedDate):
+            cache.set(self.name, data, date=requestedDate, year=self.year)
+        if self.date and self.date != requestedDate and not self.year:
+            # Billboard rounds dates up to the next chart, so also store the
+            # chart under the date it was actually published on.
+            cache.set(self.name, data, date=self.date)
+
+    def _getCalendar(self):
+        return self._calendar if self._calendar is not None else _defaultCalendar
+
+    def _canonicalizeDate(self, calendar):
+        # Ask for the chart by its canonical date, so that every date of the
+        # same week is fetched (and cached) as the same chart
+        if calendar is not None and self.date and not self.year:
+            canonicalDate = calendar.canonical(self.name, self.date)
+            if canonicalDate is not None:
+                self.date = canonicalDate
+
+    def _learnDate(self, calendar, requestedDate):
+        if calendar is not None and self.date and not self.year:
+            calendar._record(self.name, requestedDate, self.date)
+
+    def _getValidatorStore(self):
+        # Only the current chart ever changes, so it's the only one worth
+        # revalidating
+        if self.date or self.year:
+            return None
+        return _defaultValidatorStore
+
+    def _buildTree(self, html):
+        """Returns the page's document tree: a _SelectolaxPage, or a
+        BeautifulSoup object.
+        """
+        parser = self._parser or _defaultParser
+        if parser == "selectolax":
+            tree = _selectolaxTree(html)
+            if self.year or not tree.css_first("table"):
+                return _SelectolaxPage(tree)
+            # Old-style pages are only supported through BeautifulSoup
+            parser = "html.parser"
+        parseOnly = _chartRegionStrainer() if self._partialParse else None
+        return bs4.BeautifulSoup(html, parser, parse_only=parseOnly)
+
+    def _parseHtml(self, html):
+        if self._parsePool is not None:
+            self._parseInPool(html)
+            return
+        startTime = time.perf_counter()
+        tree = self._buildTree(html)
+        treeTime = time.perf_counter()
+        if isinstance(tree, _SelectolaxPage):
+            self._parseChartPage(tree)
+        else:
+            self._parsePage(tree)
+        if self.stats is not None:
+            self.stats.treeTime = treeTime - startTime
+            self.stats.entriesTime = time.perf_counter() - treeTime
+
+    def _parseInPool(self, html):
+        # Only the page goes to the worker process, and only the compact
+        # to_bytes() payload comes back
+        future = self._parsePool.submit(
+            _parseInProcess,
+            self.name,
+            self.date,
+            self.year,
+            html,
+            self._parser or _defaultParser,
+            self._partialParse,
+        )
+        payload, treeTime, entriesTime = future.result()
+        self._loadBytes(payload)
+        if self.stats is not None:
+            self.stats.treeTime = treeTime
+            self.stats.entriesTime = entriesTime
+
+    def _startStats(self):
+        if self._collectStats or _statsObservers:
+            self.stats = FetchStats()
+        else:
+            self.stats = None
+
+    def _finishStats(self, source, startTime):
+        stats = self.stats
+        if stats is None:
+            return
+        stats.source = source
+        stats.totalTime = time.perf_counter() - startTime
+        stats.entryCount = len(self.entries)
+        for observer in list(_statsObservers):
+            observer(self, stats)
 
     def fetchEntries(self):
         """GETs the corresponding chart data from Billboard.com, then parses
         the data using BeautifulSoup.
+
+        If a cache is configured and already holds this chart, the chart is
+        rebuilt from the cache instead, without any network access.
         """
-        if not self.date:
-            if not self.year:
-                # Fetch latest chart
-                url = "https://www.billboard.com/charts/%s" % (self.name)
-            else:
-                url = "https://www.billboard.com/charts/year-end/%s/%s" % (
-                    self.year,
-                    self.name,
-                )
+        if "_lazyLock" in self.__dict__:
+            self._fetchLazily()
+            return
+        fetch = self._beginFetch()
+        if fetch is None:
+            return
+
+        session = self._session
+        if session is None:
+            session = _get_session_with_retries(max_retries=self._max_retries)
+        if fetch.validated is not None:
+            req = session.get(
+                fetch.url, timeout=self._timeout, headers=fetch.validated.headers
+            )
         else:
-            url = "https://www.billboard.com/charts/%s/%s" % (self.name, self.date)
+            req = session.get(fetch.url, timeout=self._timeout)
+        if self.stats is not None:
+            self.stats._recordResponse(req, time.perf_counter() - fetch.startTime)
 
-        session = _get_session_with_retries(max_retries=self._max_retries)
-        req = session.get(url, timeout=self._timeout)
+        if fetch.validated is not None and req.status_code == 304:
+            self._finishFetch(fetch, None)
+            return
         if req.status_code == 404:
             message = "Chart not found (perhaps the name is misspelled?)"
             raise BillboardNotFoundException(message)
         req.raise_for_status()
+        self._parseHtml(req.text)
+        self._finishFetch(fetch, req.headers)
+
+    def _beginFetch(self):
+        """Runs the steps of a fetch that come before the download: starts
+        the stats, canonicalizes the date and looks the chart up in the
+        cache. Returns a _PendingFetch, or None if the chart was loaded from
+        the cache.
+        """
+        self._startStats()
+        startTime = time.perf_counter()
+        calendar = self._getCalendar()
+        originalDate = self.date
+        self._canonicalizeDate(calendar)
+        cache = self._getCache()
+        if cache is not None and self._loadFromCache(cache):
+            self._learnDate(calendar, originalDate)
+            self._finishStats("cache", startTime)
+            return None
+
+        url = self._url()
+        store = self._getValidatorStore()
+        validated = store.get(url) if store is not None else None
+        return _PendingFetch(
+            startTime, calendar, originalDate, cache, self.date, url, store, validated
+        )
+
+    def _finishFetch(self, fetch, responseHeaders):
+        """Runs the steps of a fetch that come after the page was downloaded
+        and parsed. If `responseHeaders` is None, the page had not changed,
+        so the chart is loaded from the validator store instead.
+        """
+        if responseHeaders is None:
+            fetch.store.recordNotModified()
+            self._loadBytes(fetch.validated.payload)
+            source = "not-modified"
+        else:
+            if fetch.store is not None:
+                fetch.store.set(fetch.url, responseHeaders, self.to_bytes())
+            source = "network"
+
+        if fetch.cache is not None:
+            self._storeInCache(fetch.cache, fetch.requestedDate)
+        self._learnDate(fetch.calendar, fetch.originalDate)
+        self._finishStats(source, fetch.startTime)
+
+
+class FetchStats(object):
+    """Timings and counters for one ChartData.fetchEntries() call. Times are
+    in seconds, and are None for phases that did not happen.
+
+    Attributes:
+        source: Where the chart came from: "network", "cache", or
+            "not-modified" (a conditional request; see ValidatorStore).
+        requestTime: Connecting (including DNS and TLS) and waiting for the
+            response headers.
+        downloadTime: Reading the response body.
+        treeTime: Building the page's document tree.
+        entriesTime: Extracting the chart entries from the tree.
+        totalTime: The whole fetchEntries() call.
+        responseBytes: The size of the response body.
+        retries: The number of times the request was retried.
+        entryCount: The number of chart entries.
+    """
+
+    __slots__ = (
+        "source",
+        "requestTime",
+        "downloadTime",
+        "treeTime",
+        "entriesTime",
+        "totalTime",
+        "responseBytes",
+        "retries",
+        "entryCount",
+    )
 
-        soup = BeautifulSoup(req.text, "html.parser")
-        self._parsePage(soup)
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.responseBytes = 0
+        self.retries = 0
+
+    def __repr__(self):
+        return "{}.{}({})".format(
+            self.__class__.__module__,
+            self.__class__.__name__,
+            ", ".join("%s=%r" % item for item in self.toDict().items()),
+        )
+
+    def toDict(self):
+        """Returns the stats as a dict, e.g. for sending to a metrics
+        collector.
+        """
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+    def _recordResponse(self, response, elapsedTime):
+        """Records a requests response, received `elapsedTime` seconds after
+        the fetch started.
+        """
+        # requests measures the time until the headers arrived; the rest of
+        # the request was spent reading the body
+        elapsed = getattr(response, "elapsed", None)
+        if elapsed is not None:
+            self.requestTime = elapsed.total_seconds()
+            self.downloadTime = max(0.0, elapsedTime - self.requestTime)
+        else:
+            self.requestTime = elapsedTime
+            self.downloadTime = 0.0
+        self.responseBytes = len(response.content)
+        # Failed connections are retried by urllib3, and error responses by
+        # _sendWithPolicy()
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        self.retries = len(getattr(retries, "history", ()))
+        self.retries += getattr(response, "_statusRetries", 0)
+
+
+_statsObservers = []
+
+
+def add_stats_observer(observer):
+    """Registers a function to be called as observer(chart, stats) after
+    every fetch of every chart, with the chart's FetchStats. While any
+    observer is registered, every ChartData collects stats.
+    """
+    _statsObservers.append(observer)
+
+
+def remove_stats_observer(observer):
+    """Unregisters an observer added with add_stats_observer()."""
+    _statsObservers.remove(observer)
+
+
+class AsyncChartData(ChartData):
+    """A ChartData that is downloaded with asyncio (using aiohttp), so that
+    one event loop can keep many chart downloads in flight.
+
+    Use the fetch() coroutine instead of the constructor:
+
+        chart = await AsyncChartData.fetch("hot-100", date="1979-08-04")
+
+    Pages are parsed exactly as by ChartData, so both give identical results.
+
+    Attributes:
+        max_concurrency: The max number of downloads in flight at once per
+            event loop, when fetch() isn't given its own semaphore.
+    """
+
+    max_concurrency = 32
+
+    # One semaphore per event loop, since asyncio primitives can't be shared
+    # between loops
+    _semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    async def fetch(cls, name, date=None, year=None, semaphore=None, **kwargs):
+        """Downloads and returns a chart. The arguments are the same as for
+        ChartData (except `fetch`), and:
+
+        Args:
+            session: The aiohttp.ClientSession to download with. Pass one
+                session to many fetch() calls to reuse its connections; by
+                default, a new session is opened for each call.
+            semaphore: An asyncio.Semaphore bounding concurrent downloads.
+                By default, a semaphore shared by all fetch() calls on the
+                running event loop, allowing `max_concurrency` downloads.
+        """
+        chart = cls(name, date=date, year=year, fetch=False, **kwargs)
+        await chart.fetchEntriesAsync(semaphore=semaphore)
+        return chart
+
+    async def fetchEntriesAsync(self, semaphore=None):
+        """The asyncio counterpart of fetchEntries()."""
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("AsyncChartData requires aiohttp to be installed")
+
+        fetch = self._beginFetch()
+        if fetch is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        if semaphore is None:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+
+        headers = fetch.validated.headers if fetch.validated is not None else None
+        async with semaphore:
+            if self._session is not None:
+                html, responseHeaders = await self._download(
+                    aiohttp, self._session, headers
+                )
+            else:
+                async with aiohttp.ClientSession() as session:
+                    html, responseHeaders = await self._download(
+                        aiohttp, session, headers
+                    )
+
+        if html is not None:
+            # Parse on a worker thread so that the event loop isn't blocked
+            await loop.run_in_executor(None, self._parseHtml, html)
+        self._finishFetch(fetch, responseHeaders if html is not None else None)
+
+    async def _download(self, aiohttp, session, headers=None):
+        """Returns the page's HTML and the response headers. The HTML is None
+        if conditional `headers` were sent and the page has not changed.
+        """
+        # Like the synchronous sessions, retry failed connections (but not
+        # failed reads) and the error responses listed in the retry policy up
+        # to `max_retries` times, within the process-wide rate limit
+        policy = _sessionOptions["retry_policy"] or RetryPolicy()
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=self._timeout, sock_read=self._timeout
+        )
+        kwargs = {"headers": headers} if headers else {}
+        stats = self.stats
+        for attempt in range(self._max_retries + 1):
+            limiter = _rateLimiter
+            if limiter is not None:
+                await limiter.waitAsync()
+            startTime = time.perf_counter()
+            try:
+                async with session.get(
+                    self._url(), timeout=timeout, **kwargs
+                ) as response:
+                    status = response.status
+                    if stats is not None:
+                        stats.retries = attempt
+                        stats.requestTime = time.perf_counter() - startTime
+                    if status in policy.statuses and attempt < self._max_retries:
+                        retryAfter = response.headers.get("Retry-After")
+                        delay = policy.delay(attempt, retryAfter)
+                    else:
+                        if limiter is not None and status not in _THROTTLE_STATUSES:
+                            limiter.recordSuccess()
+                        return await self._readResponse(response, headers, startTime)
+            except aiohttp.ClientConnectorError:
+                if attempt == self._max_retries:
+                    raise
+                status = None
+                delay = policy.delay(attempt)
+
+            if limiter is not None and status in _THROTTLE_STATUSES:
+                limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+
+    async def _readResponse(self, response, headers, startTime):
+        if headers and response.status == 304:
+            return None, response.headers
+        if response.status == 404:
+            message = "Chart not found (perhaps the name is misspelled?)"
+            raise BillboardNotFoundException(message)
+        response.raise_for_status()
+        html = await response.text()
+        stats = self.stats
+        if stats is not None:
+            stats.downloadTime = time.perf_counter() - startTime - stats.requestTime
+            stats.responseBytes = len(html.encode("utf-8"))
+        return html, response.headers
+
+
+_sessionOptions = {
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+    "pool_block": False,
+    "keep_alive": True,
+    "retry_policy": None,
+    "cassette": None,
+    "cassette_mode": "replay",
+}
+_sharedSessions = {}
+_sharedSessionsLock = threading.Lock()
+
+
+def make_session(
+    max_retries=5,
+    pool_connections=10,
+    pool_maxsize=10,
+    pool_block=False,
+    keep_alive=True,
+    retry_policy=None,
+    cassette=None,
+    cassette_mode="replay",
+):
+    """Returns a new requests.Session for fetching charts.
+
+    Args:
+        max_retries: The max number of times to retry a failed request
+            (a failed connection, or an error response listed in the retry
+            policy).
+        pool_connections: The number of connection pools to cache.
+        pool_maxsize: The max number of connections kept open to
+            Billboard.com. Set this to at least the number of threads that
+            share the session.
+        pool_block: Whether to wait for a free connection when the pool is
+            exhausted, instead of opening a throwaway one.
+        keep_alive: Whether to keep connections open between requests.
+        retry_policy: The RetryPolicy that sets how long to wait between
+            retries. By default, RetryPolicy().
+        cassette: The path of a cassette directory. If given, requests go
+            through a CassetteAdapter on it, in the mode given by
+            `cassette_mode` (see CassetteAdapter). Passing it to
+            configure_session() runs any code, such as the test suite,
+            against recorded responses.
+
+    Requests made with the session respect the process-wide rate limit (see
+    set_rate_limit()), including retries.
+    """
+    session = requests.Session()
+    if retry_policy is None:
+        retry_policy = RetryPolicy()
+    poolOptions = dict(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    if cassette:
+        adapter = CassetteAdapter(
+            cassette,
+            mode=cassette_mode,
+            upstream=requests.adapters.HTTPAdapter(
+                max_retries=retry_policy._connectionRetries(max_retries), **poolOptions
+            ),
+            retry_policy=retry_policy,
+            max_retries=max_retries,
+        )
+    else:
+        adapter = _makeChartAdapter(retry_policy, max_retries, **poolOptions)
+    session.mount("https://www.billboard.com", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def configure_session(**options):
+    """Changes the options (see make_session()) of the connection-pooled
+    sessions shared by all ChartData instances. Open connections are closed.
+    """
+    unknown = set(options) - set(_sessionOptions)
+    if unknown:
+        raise TypeError("Unknown session options: %s" % ", ".join(sorted(unknown)))
+    with _sharedSessionsLock:
+        _sessionOptions.update(options)
+        for session in _sharedSessions.values():
+            session.close()
+        _sharedSessions.clear()
 
 
 def _get_session_with_retries(max_retries):
+    # requests.Session is safe to share between threads for plain GETs, and
+    # sharing it lets every fetch reuse pooled keep-alive connections.
+    with _sharedSessionsLock:
+        session = _sharedSessions.get(max_retries)
+        if session is None:
+            session = make_session(max_retries=max_retries, **_sessionOptions)
+            _sharedSessions[max_retries] = session
+    return session
+
+
+# Headers that describe how the recorded body was sent, not the body itself
+_UNRECORDED_HEADERS = frozenset(
+    [
+        "connection",
+        "content-encoding",
+        "content-length",
+        "keep-alive",
+        "transfer-encoding",
+    ]
+)
+
+
+class CassetteAdapter(object):
+    """A requests transport adapter that records Billboard.com responses
+    into a directory (a "cassette") and replays them later, without network
+    access. It can also simulate a slow or failing server.
+
+    Mount it on a session and pass the session to ChartData, or use
+    make_cassette_session():
+
+        session = billboard.make_cassette_session("cassettes/", mode="auto")
+        chart = billboard.ChartData("hot-100", date="1979-08-04", session=session)
+
+    Each response is stored as a JSON file named after the URL. Error
+    responses for rate limiting (429) and server errors (5xx) are never
+    recorded.
+
+    Args:
+        path: The cassette directory.
+        mode: "replay" to only use recorded responses (a request that was
+            never recorded raises requests.exceptions.ConnectionError),
+            "record" to always download and record responses, or "auto" to
+            replay the responses that were recorded and record the rest.
+        upstream: The adapter used to download responses when recording. By
+            default, a requests HTTPAdapter.
+        latency: Seconds to wait before each response, or a (min, max) tuple
+            to wait a random time in that range.
+        faults: A dict mapping HTTP status codes (e.g. 404, 429 or 503) to
+            the probability of answering a request with that error instead.
+            429 responses have a Retry-After header of `retry_after`.
+        seed: The seed for the random latency and faults, for repeatable
+            runs.
+        retry_after: The Retry-After value, in seconds, sent with simulated
+            429 responses.
+        retry_policy: A RetryPolicy for retrying error responses (simulated
+            or real), or None to never retry them.
+        max_retries: The max number of times to retry an error response.
+
+    Like other sessions, requests also respect the process-wide rate limit
+    (see set_rate_limit()).
+    """
+
+    MODES = ("replay", "record", "auto")
+
+    def __init__(
+        self,
+        path,
+        mode="replay",
+        upstream=None,
+        latency=0,
+        faults=None,
+        seed=None,
+        retry_after=1,
+        retry_policy=None,
+        max_retries=0,
+    ):
+        super(CassetteAdapter, self).__init__()
+        if mode not in self.MODES:
+            raise ValueError("mode must be one of %s" % ", ".join(self.MODES))
+        self.path = path
+        self.mode = mode
+        self.upstream = upstream
+        self.latency = latency
+        self.faults = dict(faults or {})
+        self.retry_after = retry_after
+        self.retry_policy = retry_policy
+        self.max_retries = max_retries
+        self._random = random.Random(seed)
+        self._randomLock = threading.Lock()
+
+    def _filename(self, url):
+        path = url.split("://", 1)[-1].split("/", 1)[-1]
+        return os.path.join(self.path, quote(path, safe="") + ".json")
+
+    def _roll(self):
+        """Returns the delay and the simulated error status (or None) for one
+        request.
+        """
+        with self._randomLock:
+            if isinstance(self.latency, (tuple, list)):
+                delay = self._random.uniform(*self.latency)
+            else:
+                delay = self.latency
+            roll = self._random.random()
+        for status, probability in sorted(self.faults.items()):
+            if roll < probability:
+                return delay, status
+            roll -= probability
+        return delay, None
+
+    def _makeResponse(self, request, status, headers, body):
+        response = requests.models.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = body.encode("utf-8")
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.reason = http.client.responses.get(status, "")
+        response.url = request.url
+        response.request = request
+        return response
+
+    def _replay(self, request, recorded):
+        headers = requests.structures.CaseInsensitiveDict(recorded["headers"])
+        etag = headers.get("ETag")
+        if etag is not None and request.headers.get("If-None-Match") == etag:
+            return self._makeResponse(request, 304, {"ETag": etag}, "")
+        return self._makeResponse(
+            request, recorded["status"], headers, recorded["body"]
+        )
+
+    def _record(self, request, **kwargs):
+        if self.upstream is None:
+            self.upstream = requests.adapters.HTTPAdapter()
+        # Ask for the full page, even if the caller has a cached copy
+        request = request.copy()
+        request.headers.pop("If-None-Match", None)
+        request.headers.pop("If-Modified-Since", None)
+        response = self.upstream.send(request, **kwargs)
+        if response.status_code != 429 and response.status_code < 500:
+            headers = dict(
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower() not in _UNRECORDED_HEADERS
+            )
+            recorded = {
+                "url": request.url,
+                "status": response.status_code,
+                "headers": headers,
+                "body": response.text,
+            }
+            data = json.dumps(recorded, indent=1, sort_keys=True)
+            _writeAtomically(self._filename(request.url), data.encode("utf-8"))
+        return response
+
+    def send(self, request, **kwargs):
+        return _sendWithPolicy(
+            self._sendOnce, request, self.retry_policy, self.max_retries, **kwargs
+        )
+
+    def _sendOnce(self, request, **kwargs):
+        delay, faultStatus = self._roll()
+        if delay:
+            time.sleep(delay)
+        if faultStatus is not None:
+            headers = {}
+            if faultStatus == 429:
+                headers["Retry-After"] = str(self.retry_after)
+            return self._makeResponse(request, faultStatus, headers, "")
+
+        recorded = None
+        if self.mode != "record":
+            try:
+                with open(self._filename(request.url), "rb") as f:
+                    recorded = json.loads(f.read().decode("utf-8"))
+            except (IOError, OSError):
+                if self.mode == "replay":
+                    message = "No recorded response for %s" % request.url
+                    raise requests.exceptions.ConnectionError(message, request=request)
+        if recorded is not None:
+            return self._replay(request, recorded)
+        return self._record(request, **kwargs)
+
+    def close(self):
+        if self.upstream is not None:
+            self.upstream.close()
+
+
+def make_cassette_session(
+    path, mode="replay", max_retries=5, retry_policy=None, **kwargs
+):
+    """Returns a new requests.Session whose Billboard.com requests go
+    through a CassetteAdapter, with the same retry behavior as sessions
+    made by make_session().
+
+    Args:
+        path, mode: See CassetteAdapter.
+        max_retries: The max number of times to retry a failed request.
+        retry_policy: The RetryPolicy to follow. By default, RetryPolicy().
+        **kwargs: Passed on to CassetteAdapter.
+    """
     session = requests.Session()
-    session.mount(
-        "https://www.billboard.com",
-        requests.adapters.HTTPAdapter(max_retries=max_retries),
+    if retry_policy is None:
+        retry_policy = RetryPolicy()
+    upstream = requests.adapters.HTTPAdapter(
+        max_retries=retry_policy._connectionRetries(max_retries)
+    )
+    adapter = CassetteAdapter(
+        path,
+        mode=mode,
+        upstream=upstream,
+        retry_policy=retry_policy,
+        max_retries=max_retries,
+        **kwargs
     )
+    session.mount("https://www.billboard.com", adapter)
     return session
+
+
+class RetryPolicy(object):
+    """Sets which failed requests are retried, and how long to wait first.
+
+    Failed connections and the listed error responses are retried up to
+    `max_retries` times (see ChartData). The wait doubles after each
+    attempt, plus a random jitter so that threads that failed together
+    don't all retry at the same moment. If the response has a Retry-After
+    header, it is obeyed instead.
+
+    Args:
+        backoff_factor: The number of seconds to wait before the first
+            retry. The wait doubles for each further retry.
+        backoff_max: The max number of seconds to wait (except when obeying
+            Retry-After).
+        jitter: The max number of random seconds added to each wait.
+        statuses: The HTTP statuses of the responses to retry.
+        respect_retry_after: Whether to obey Retry-After headers.
+    """
+
+    def __init__(
+        self,
+        backoff_factor=0.5,
+        backoff_max=60,
+        jitter=0.5,
+        statuses=(429, 500, 502, 503, 504),
+        respect_retry_after=True,
+    ):
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.respect_retry_after = respect_retry_after
+
+    def delay(self, attempt, retryAfter=None):
+        """Returns the number of seconds to wait before retrying a request
+        that failed `attempt` times before (starting at 0), given the
+        Retry-After header of the failed response (if any).
+        """
+        if self.respect_retry_after:
+            seconds = _parseRetryAfter(retryAfter)
+            if seconds is not None:
+                return seconds
+        backoff = min(self.backoff_max, self.backoff_factor * 2**attempt)
+        return backoff + random.uniform(0, self.jitter)
+
+    def _connectionRetries(self, max_retries):
+        # Failed connections are retried by urllib3, with the same backoff
+        return urllib3.util.retry.Retry(
+            total=max_retries, read=False, backoff_factor=self.backoff_factor
+        )
+
+
+def _parseRetryAfter(value):
+    """Returns the number of seconds given by a Retry-After header, which
+    can be a number of seconds or an HTTP date, or None.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (date - now).total_seconds())
+
+
+# Responses that mean Billboard.com wants fewer requests from us
+_THROTTLE_STATUSES = frozenset([429, 503])
+
+
+class RateLimiter(object):
+    """A token bucket that limits how often requests are started, across all
+    the threads (and event loops) that share it.
+
+    Args:
+        rate: The max number of requests to start per second.
+        burst: The number of requests that can start at once after a quiet
+            spell.
+        adaptive: If True, the rate is halved whenever Billboard.com answers
+            429 Too Many Requests or 503 Service Unavailable, and then grows
+            back to `rate` as requests succeed. This keeps requests flowing
+            at about the highest rate the server tolerates.
+
+    Attributes:
+        rate: The current max number of requests per second.
+    """
+
+    def __init__(self, rate, burst=1, adaptive=True):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.maxRate = float(rate)
+        self.rate = float(rate)
+        self.burst = burst
+        self.adaptive = adaptive
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._resumeAt = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Takes a token and returns 0 if one is available, or returns the
+        number of seconds to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._resumeAt:
+                return self._resumeAt - now
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def wait(self):
+        """Blocks until a request may start."""
+        waitTime = self._reserve()
+        while waitTime > 0:
+            time.sleep(waitTime)
+            waitTime = self._reserve()
+
+    async def waitAsync(self):
+        """The asyncio counterpart of wait()."""
+        waitTime = self._reserve()
+        while waitTime > 0:
+            await asyncio.sleep(waitTime)
+            waitTime = self._reserve()
+
+    def pause(self, seconds):
+        """Holds back every request for `seconds`, e.g. after a 429 response,
+        and lowers the rate if the limiter is adaptive.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._resumeAt = max(self._resumeAt, now + seconds)
+            self._tokens = 0.0
+            self._updated = self._resumeAt
+            if self.adaptive:
+                self.rate = max(self.maxRate / 32, self.rate / 2)
+
+    def recordSuccess(self):
+        """Lets an adaptive limiter's rate grow back after a pause."""
+        if self.adaptive and self.rate < self.maxRate:
+            with self._lock:
+                self.rate = min(self.maxRate, self.rate + self.maxRate / 20)
+
+
+_rateLimiter = None
+
+
+def set_rate_limit(rate, burst=1, adaptive=True):
+    """Limits how many requests per second all chart fetches in the process
+    start together, with a shared RateLimiter. Pass None (or 0) to remove
+    the limit.
+    See RateLimiter for the arguments.
+    """
+    global _rateLimiter
+    _rateLimiter = RateLimiter(rate, burst, adaptive) if rate else None
+
+
+def _sendWithPolicy(send, request, policy, maxRetries, **kwargs):
+    """Sends a request with send(request, **kwargs), respecting the rate
+    limit and retrying the error responses listed in the retry policy.
+    """
+    attempt = 0
+    while True:
+        limiter = _rateLimiter
+        if limiter is not None:
+            limiter.wait()
+        response = send(request, **kwargs)
+        status = response.status_code
+        if policy is None or status not in policy.statuses or attempt >= maxRetries:
+            if limiter is not None and status not in _THROTTLE_STATUSES:
+                limiter.recordSuccess()
+            response._statusRetries = attempt
+            return response
+
+        delay = policy.delay(attempt, response.headers.get("Retry-After"))
+        response.close()
+        if limiter is not None and status in _THROTTLE_STATUSES:
+            # Hold back every thread, not just this one, so that they don't
+            # all hit the server again the moment their own waits are over
+            limiter.pause(delay)
+        else:
+            time.sleep(delay)
+        attempt += 1
+
+
+@functools.lru_cache(maxsize=None)
+def _lazySubclass(mixin, module, baseName):
+    """Returns a class deriving from `mixin` and from the class `baseName` of
+    `module`. The module is only imported when the class is first needed.
+    """
+    base = getattr(importlib.import_module(module), baseName)
+    name = mixin.__name__[: -len("Mixin")]
+    return type(name, (mixin, base), {"__module__": __name__, "__doc__": mixin.__doc__})
+
+
+class _ChartAdapterMixin(object):
+    """The HTTPAdapter used for Billboard.com, which applies a RetryPolicy
+    and the process-wide rate limit.
+    """
+
+    def __init__(self, retry_policy, max_retries, **kwargs):
+        super(_ChartAdapterMixin, self).__init__(
+            max_retries=retry_policy._connectionRetries(max_retries), **kwargs
+        )
+        self.retry_policy = retry_policy
+        self._maxStatusRetries = max_retries
+
+    def send(self, request, **kwargs):
+        send = super(_ChartAdapterMixin, self).send
+        return _sendWithPolicy(
+            send, request, self.retry_policy, self._maxStatusRetries, **kwargs
+        )
+
+
+def _makeChartAdapter(retry_policy, max_retries, **kwargs):
+    adapterClass = _lazySubclass(_ChartAdapterMixin, "requests.adapters", "HTTPAdapter")
+    return adapterClass(retry_policy, max_retries, **kwargs)
+
+
+FetchResult = collections.namedtuple(
+    "FetchResult", ["name", "date", "year", "chart", "error"]
+)
+FetchResult.__doc__ = """The outcome of fetching one chart with fetch_many().
+
+Attributes:
+    name, date, year: The chart that was requested.
+    chart: The ChartData instance, or None if fetching failed.
+    error: The exception raised while fetching, or None on success.
+"""
+
+
+def _fetchErrors():
+    """Returns the errors that fetch_many() reports per chart instead of
+    raising.
+    """
+    return (
+        BillboardNotFoundException,
+        BillboardParseException,
+        ValueError,
+        requests.exceptions.RequestException,
+    )
+
+
+def _parseQuery(query):
+    if isinstance(query, str):
+        return query, None, None
+    name = query[0]
+    value = query[1] if len(query) > 1 else None
+    if value is not None and re.match(r"^\d{4}$", str(value)):
+        return name, None, str(value)
+    return name, value, None
+
+
+def _parseInProcess(name, date, year, html, parser, partialParse):
+    """Parses a chart page in a worker process of fetch_many()'s parse pool.
+    Returns the chart's to_bytes() payload and the times spent building the
+    document tree and extracting the entries.
+    """
+    chart = ChartData(
+        name,
+        date=date,
+        year=year,
+        fetch=False,
+        parser=parser,
+        partial_parse=partialParse,
+    )
+    chart.stats = FetchStats()
+    chart._parseHtml(html)
+    return chart.to_bytes(), chart.stats.treeTime, chart.stats.entriesTime
+
+
+def fetch_many(
+    queries,
+    max_workers=8,
+    rate_limit=None,
+    ordered=True,
+    parse_processes=None,
+    **kwargs
+):
+    """Fetches many charts concurrently on a thread pool.
+
+    Args:
+        queries: An iterable of chart names or (name, date) tuples. A date
+            in YYYY format (or an int) requests that year's year-end chart;
+            a date of None requests the latest chart.
+        max_workers: The number of charts to fetch at the same time.
+        rate_limit: The max number of charts to start fetching per second,
+            or None (or 0) for no limit. (This is on top of the process-wide limit
+            set with set_rate_limit().)
+        ordered: If True, results are yielded in the order of `queries`.
+            Otherwise they are yielded as soon as each chart is fetched.
+        parse_processes: The number of worker processes to parse pages on,
+            or None to parse them on the download threads. Parsing is CPU
+            work that holds the GIL, so with many workers, a process pool
+            (e.g. of os.cpu_count() processes) keeps more cores busy.
+        **kwargs: Passed on to the ChartData constructor.
+
+    Returns:
+        A generator of FetchResult tuples. A chart that fails to fetch does
+        not stop the others; its error is reported in the FetchResult.
+
+    Only a few charts per worker are fetched ahead of the caller, so
+    `queries` can be a long (or endless) iterable. With a parse pool, each
+    download thread waits for its page to be parsed before downloading the
+    next one, so at most `max_workers` pages wait to be parsed at a time.
+
+    The parse pool's processes are started with the "spawn" method, so a
+    script that uses it must be importable without side effects (i.e. guard
+    its code with `if __name__ == "__main__":`).
+    """
+    queries = (_parseQuery(query) for query in queries)
+    limiter = RateLimiter(rate_limit, adaptive=False) if rate_limit else None
+    ownSession = None
+    if "session" not in kwargs and max_workers > _sessionOptions["pool_maxsize"]:
+        # Make sure that every worker can keep its own connection open
+        options = dict(_sessionOptions, pool_maxsize=max_workers)
+        ownSession = make_session(max_retries=kwargs.get("max_retries", 5), **options)
+        kwargs["session"] = ownSession
+
+    fetchErrors = _fetchErrors()
+    parsePool = None
+    if parse_processes:
+        # Don't fork this process, whose other threads may hold locks
+        parsePool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=parse_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def fetchChart(name, date, year):
+        if parsePool is None:
+            return ChartData(name, date=date, year=year, **kwargs)
+        chart = ChartData(name, date=date, year=year, fetch=False, **kwargs)
+        chart._parsePool = parsePool
+        try:
+            chart.fetchEntries()
+        finally:
+            chart._parsePool = None
+        return chart
+
+    def fetchOne(query):
+        name, date, year = query
+        if limiter is not None:
+            limiter.wait()
+        try:
+            chart = fetchChart(name, date, year)
+        except fetchErrors as e:
+            return FetchResult(name, date, year, None, e)
+        return FetchResult(name, date, year, chart, None)
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(count):
+        return [
+            executor.submit(fetchOne, query)
+            for query in itertools.islice(queries, count)
+        ]
+
+    # Futures are dropped as soon as their result is yielded, so that
+    # fetched charts aren't kept alive until the whole batch is done
+    window = 2 * max_workers
+    pending = ()
+    try:
+        if ordered:
+            pending = collections.deque(submit(window))
+            while pending:
+                result = pending.popleft().result()
+                pending.extend(submit(1))
+                yield result
+        else:
+            pending = set(submit(window))
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                pending.update(submit(len(done)))
+                for future in done:
+                    yield future.result()
+    finally:
+        # If the caller stops early, don't fetch charts nobody will read
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+        if parsePool is not None:
+            parsePool.shutdown(wait=False)
+        if ownSession is not None:
+            ownSession.close()
+
+
+def _toDate(value):
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def iter_charts(name, start, end=None, step="week", prefetch=4, **kwargs):
+    """Yields a chart's weekly ChartData instances between two dates, in order,
+    while the next few charts are downloaded in the background.
+
+    Billboard rounds every date up to the next date on which the chart was
+    published, so the first chart found fixes the chart's publication weekday
+    and later dates are computed from it (and corrected if the weekday ever
+    changes).
+
+    Args:
+        name: The chart name, e.g. 'hot-100'.
+        start: The first date, as a YYYY-MM-DD string or a date.
+        end: The last date (inclusive). If it is before `start`, charts are
+            yielded from newest to oldest. By default, today.
+        step: "week" for every chart, or an int N for every Nth week.
+        prefetch: The number of charts to download ahead of the one being
+            read. If 0, charts are downloaded one at a time.
+        **kwargs: Passed on to the ChartData constructor.
+    """
+    if step == "week":
+        weeks = 1
+    elif isinstance(step, int) and step > 0:
+        weeks = step
+    else:
+        raise ValueError('step must be "week" or a positive number of weeks')
+
+    start = _toDate(start)
+    end = _toDate(end) if end is not None else datetime.date.today()
+    backward = end < start
+    delta = datetime.timedelta(weeks=-weeks if backward else weeks)
+    oneDay = datetime.timedelta(days=1)
+    # Going forward, asking for the day after the previous week's chart
+    # (instead of the expected date itself) makes Billboard round up to the
+    # next chart even if the publication weekday moved earlier.
+    lead = datetime.timedelta(days=0 if backward else 6)
+
+    def inRange(date):
+        return end <= date <= start if backward else start <= date <= end
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=prefetch + 1)
+
+    def submit(date):
+        return executor.submit(
+            ChartData, name, date=date.strftime("%Y-%m-%d"), **kwargs
+        )
+
+    # The first chart can be for any date on or after `start`
+    pending = collections.deque([(None, submit(start))])
+    lastDate = None
+    try:
+        while pending:
+            expectedDate, future = pending.popleft()
+            chart = future.result()
+            chartDate = _toDate(chart.date) if chart.date else expectedDate or start
+            isNew = lastDate is None or (
+                chartDate < lastDate if backward else chartDate > lastDate
+            )
+            yielded = isNew and inRange(chartDate)
+            if yielded:
+                lastDate = chartDate
+                yield chart
+
+            if chartDate != expectedDate:
+                # Either this is the first chart, or the publication weekday
+                # changed and the charts queued after this one are for the
+                # wrong dates. Either way, realign on the date we got.
+                for _, queued in pending:
+                    queued.cancel()
+                pending.clear()
+                if yielded:
+                    nextDate = chartDate + delta
+                elif backward:
+                    # The chart we want comes before the one we got
+                    nextDate = min(chartDate + delta, (expectedDate or start) - oneDay)
+                else:
+                    nextDate = max(chartDate, expectedDate or start) + delta
+
+            while len(pending) <= prefetch and inRange(nextDate - lead):
+                pending.append((nextDate, submit(nextDate - lead)))
+                nextDate += delta
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+ChartEvent = collections.namedtuple("ChartEvent", ["name", "chart", "previousDate"])
+ChartEvent.__doc__ = """A new chart found by watch().
+
+Attributes:
+    name: The chart name.
+    chart: The new ChartData instance.
+    previousDate: The date of the chart it replaces.
+"""
+
+# How long before the expected publication time watch() starts polling at
+# its normal interval again
+_PUBLICATION_WINDOW = 24 * 3600
+
+
+def watch(
+    names, interval=300, max_interval=3600, period=7 * 24 * 3600, known=None, **kwargs
+):
+    """Polls the current charts and yields a ChartEvent whenever one of them
+    is replaced by a new chart (i.e. its date changes).
+
+    Charts are polled one at a time over the shared session, and with
+    conditional requests (see ValidatorStore), so a poll that finds nothing
+    new is cheap. After a new chart is found, that chart is polled only
+    every `max_interval` seconds until a day before the next one is due.
+    Polls that fail with a network error, or whose page can't be found or
+    parsed, are retried with exponential backoff, up to `max_interval`.
+
+    The generator runs until the caller stops iterating over it:
+
+        for event in billboard.watch(['hot-100', 'billboard-200']):
+            print(event.name, event.chart.date)
+
+    Args:
+        names: A chart name, or a list of them.
+        interval: The number of seconds between polls of each chart.
+        max_interval: The max number of seconds between polls of a chart.
+        period: The number of seconds between the publication of two
+            charts, or None to always poll every `interval` seconds.
+        known: A dict mapping chart names to the date of the last chart
+            seen, e.g. before a restart. A chart that isn't in it yields
+            no event for its first poll; the date found is just recorded.
+        **kwargs: Passed on to the ChartData constructor. Polls bypass the
+            chart cache unless a `cache` is given, since a cached current
+            chart could hide a new one for up to its `current_ttl`.
+    """
+    kwargs.setdefault("cache", False)
+    if isinstance(names, str):
+        names = [names]
+    dates = dict(known or {})
+    failures = dict.fromkeys(names, 0)
+    quietUntil = dict.fromkeys(names, 0.0)
+
+    # (next poll time, position, name), so that ties are polled in order
+    schedule = [(0.0, i, name) for i, name in enumerate(names)]
+    while True:
+        pollTime, i, name = heapq.heappop(schedule)
+        waitTime = pollTime - time.time()
+        if waitTime > 0:
+            time.sleep(waitTime)
+
+        try:
+            chart = ChartData(name, **kwargs)
+        except (
+            BillboardNotFoundException,
+            BillboardParseException,
+            requests.exceptions.RequestException,
+        ):
+            failures[name] += 1
+            delay = min(interval * 2 ** failures[name], max_interval)
+        else:
+            failures[name] = 0
+            now = time.time()
+            previousDate = dates.get(name)
+            if chart.date:
+                dates[name] = chart.date
+            if previousDate is not None and chart.date not in (None, previousDate):
+                if period:
+                    quietUntil[name] = now + period - _PUBLICATION_WINDOW
+                yield ChartEvent(name, chart, previousDate)
+                now = time.time()
+            delay = interval
+            if quietUntil[name] > now:
+                delay = max(interval, min(max_interval, quietUntil[name] - now))
+        heapq.heappush(schedule, (time.time() + delay, i, name))
+
+
+class ChartCache(object):
+    """Base class for persistent chart caches consulted by
+    ChartData.fetchEntries().
+
+    Charts are keyed by (name, date) or (name, year). Dated and year-end
+    charts never change once published, so they are kept forever; the
+    current chart (no date or year) expires after `current_ttl` seconds.
+
+    Subclasses implement _read() and _write().
+
+    Attributes:
+        current_ttl: The number of seconds for which a cached current chart
+            stays valid. If None, it never expires.
+        hits: The number of lookups answered from the cache.
+        misses: The number of lookups that were not.
+    """
+
+    def __init__(self, current_ttl=3600):
+        self.current_ttl = current_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, name, date=None, year=None):
+        """Returns the cached chart as bytes (see ChartData.to_bytes), or None
+        if it is missing or has expired.
+        """
+        key = _cacheKey(date, year)
+        stored = self._read(name, key)
+        if stored is not None:
+            storedAt, payload = stored
+            expired = (
+                key == _CURRENT_CHART_KEY
+                and self.current_ttl is not None
+                and time.time() - storedAt > self.current_ttl
+            )
+            # Entries written in an older format (such as the JSON stored by
+            # earlier versions) are treated as misses, and replaced once the
+            # chart has been fetched again.
+            if not expired and _isCurrentChartFormat(payload):
+                with self._lock:
+                    self.hits += 1
+                return payload
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, name, payload, date=None, year=None):
+        """Stores a chart, given as bytes (see ChartData.to_bytes)."""
+        self._write(name, _cacheKey(date, year), time.time(), payload)
+
+    def _read(self, name, key):
+        """Returns a (storedAt, payload) tuple, or None if nothing is stored."""
+        raise NotImplementedError
+
+    def _write(self, name, key, storedAt, payload):
+        raise NotImplementedError
+
+
+class DirectoryChartCache(ChartCache):
+    """A ChartCache that keeps one file per chart under a directory."""
+
+    def __init__(self, path, current_ttl=3600):
+        super(DirectoryChartCache, self).__init__(current_ttl=current_ttl)
+        self.path = path
+
+    def _filename(self, name, key):
+        return os.path.join(self.path, name, key.replace("/", "-") + ".chart")
+
+    def _read(self, name, key):
+        filename = self._filename(name, key)
+        try:
+            with open(filename, "rb") as f:
+                payload = f.read()
+            storedAt = os.path.getmtime(filename)
+        except (IOError, OSError):
+            return None
+        return storedAt, payload
+
+    def _write(self, name, key, storedAt, payload):
+        _writeAtomically(self._filename(name, key), payload, mtime=storedAt)
+
+
+def _makeDirs(directory):
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+
+def _writeAtomically(filename, payload, mtime=None):
+    directory = os.path.dirname(filename)
+    _makeDirs(directory)
+    # Write to a temporary file first so readers never see partial data
+    fd, tmpName = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        if mtime is not None:
+            os.utime(tmpName, (mtime, mtime))
+        os.replace(tmpName, filename)
+    except:
+        os.remove(tmpName)
+        raise
+
+
+class SQLiteChartCache(ChartCache):
+    """A ChartCache backed by a single SQLite database file."""
+
+    def __init__(self, path, current_ttl=3600):
+        super(SQLiteChartCache, self).__init__(current_ttl=current_ttl)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._dbLock = threading.Lock()
+        with self._dbLock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS charts ("
+                "name TEXT NOT NULL, key TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "payload BLOB NOT NULL, PRIMARY KEY (name, key))"
+            )
+
+    def _read(self, name, key):
+        with self._dbLock:
+            row = self._connection.execute(
+                "SELECT stored_at, payload FROM charts WHERE name = ? AND key = ?",
+                (name, key),
+            ).fetchone()
+        return row
+
+    def _write(self, name, key, storedAt, payload):
+        with self._dbLock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO charts VALUES (?, ?, ?, ?)",
+                (name, key, storedAt, payload),
+            )
+
+    def close(self):
+        self._connection.close()
+
+
+SyncResult = collections.namedtuple("SyncResult", ["stored", "skipped", "errors"])
+SyncResult.__doc__ = """The outcome of ChartArchive.sync().
+
+Attributes:
+    stored: The dates of the charts that were added to the archive, in order.
+    skipped: The number of weeks that were already in the archive.
+    errors: FetchResult tuples for the weeks that could not be fetched. They
+        are retried by the next sync.
+"""
+
+_ARCHIVE_FILENAME = re.compile(r"^(\d{4}-\d{2}-\d{2})\.chart$")
+
+
+class ChartArchive(object):
+    """A local mirror of weekly charts, kept up to date with sync().
+
+    Each chart is stored in its own file, `<path>/<name>/<date>.chart` (see
+    ChartData.to_bytes), next to a journal that records which dates have
+    already been asked for. Charts and journal lines are only ever added,
+    so a sync that is interrupted can simply be run again: it picks up
+    where the last one stopped instead of starting from scratch.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _directory(self, name):
+        return os.path.join(self.path, name)
+
+    def _journalFilename(self, name):
+        return os.path.join(self._directory(name), "sync.journal")
+
+    def dates(self, name):
+        """Returns the dates of the archived charts, as a sorted list of
+        YYYY-MM-DD strings.
+        """
+        try:
+            filenames = os.listdir(self._directory(name))
+        except (IOError, OSError):
+            return []
+        matches = [_ARCHIVE_FILENAME.match(filename) for filename in filenames]
+        return sorted(match.group(1) for match in matches if match)
+
+    def load(self, name, date, **kwargs):
+        """Returns the archived chart for a date as a ChartData instance.
+
+        Args:
+            name: The chart name, e.g. 'hot-100'.
+            date: The chart's date, as a YYYY-MM-DD string or a date.
+            **kwargs: Passed on to ChartData.from_bytes().
+        """
+        date = _toDate(date).strftime("%Y-%m-%d")
+        filename = os.path.join(self._directory(name), date + ".chart")
+        try:
+            with open(filename, "rb") as f:
+                payload = f.read()
+        except (IOError, OSError):
+            message = "No chart for %s on %s in the archive" % (name, date)
+            raise BillboardNotFoundException(message)
+        return ChartData.from_bytes(payload, **kwargs)
+
+    def charts(self, name, **kwargs):
+        """Yields every archived chart for `name` as a ChartData instance,
+        oldest first. Keyword arguments are passed on to load().
+        """
+        for date in self.dates(name):
+            yield self.load(name, date, **kwargs)
+
+    def _readGaps(self, name):
+        """Returns the (requested, chartDate) pairs from the journal that show
+        a week with no chart, i.e. where Billboard rounded the requested date
+        up by more than six days.
+        """
+        gaps = []
+        try:
+            with open(self._journalFilename(name)) as f:
+                lines = f.readlines()
+        except (IOError, OSError):
+            return gaps
+        for line in lines:
+            try:
+                requested, chartDate = [_toDate(field) for field in line.split()]
+            except ValueError:
+                # A line cut short by a crash; the week is simply fetched again
+                continue
+            if (chartDate - requested).days > 6:
+                gaps.append((requested, chartDate))
+        return gaps
+
+    def sync(
+        self, name, since=None, until=None, max_workers=8, rate_limit=None, **kwargs
+    ):
+        """Fetches the weekly charts that are missing from the archive.
+
+        The range is split into weeks starting at `since`. A week is skipped
+        if an archived chart falls in it, or if the journal shows that no
+        chart was published in it. The other weeks are fetched concurrently
+        with fetch_many(), and each chart is written to the archive as soon
+        as it arrives.
+
+        Args:
+            name: The chart name, e.g. 'hot-100'.
+            since: The first date to sync, as a YYYY-MM-DD string or a date.
+                By default, the day after the newest archived chart.
+            until: The last date to sync. By default, today.
+            max_workers: The number of charts to fetch at the same time.
+            rate_limit: The max number of requests to start per second, or
+                None (or 0) for no limit.
+            **kwargs: Passed on to the ChartData constructor.
+
+        Returns:
+            A SyncResult.
+        """
+        stored = [_toDate(date) for date in self.dates(name)]
+        if since is None:
+            if not stored:
+                raise ValueError("since is required when nothing is archived yet")
+            since = stored[-1] + datetime.timedelta(days=1)
+        since = _toDate(since)
+        until = _toDate(until) if until is not None else datetime.date.today()
+        gaps = self._readGaps(name)
+
+        def isArchived(weekStart):
+            weekEnd = weekStart + datetime.timedelta(days=6)
+            i = bisect.bisect_left(stored, weekStart)
+            if i < len(stored) and stored[i] <= weekEnd:
+                return True
+            return any(
+                requested <= weekStart and chartDate > weekEnd
+                for requested, chartDate in gaps
+            )
+
+        missing = []
+        skipped = 0
+        weekStart = since
+        while weekStart <= until:
+            if isArchived(weekStart):
+                skipped += 1
+            else:
+                missing.append(weekStart)
+            weekStart += datetime.timedelta(weeks=1)
+
+        queries = [(name, date.strftime("%Y-%m-%d")) for date in missing]
+        results = fetch_many(
+            queries,
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+            ordered=False,
+            **kwargs
+        )
+        archived = set(stored)
+        added = []
+        errors = []
+        _makeDirs(self._directory(name))
+        with open(self._journalFilename(name), "a") as journal:
+            for result in results:
+                if result.error is not None:
+                    errors.append(result)
+                    continue
+                if not result.chart.date:
+                    error = BillboardParseException("Chart has no date")
+                    errors.append(result._replace(chart=None, error=error))
+                    continue
+                chartDate = _toDate(result.chart.date)
+                if chartDate not in archived:
+                    filename = os.path.join(
+                        self._directory(name), result.chart.date + ".chart"
+                    )
+                    _writeAtomically(filename, result.chart.to_bytes())
+                    archived.add(chartDate)
+                    added.append(result.chart.date)
+                requested = _toDate(result.date)
+                if chartDate >= requested:
+                    # Only record the week once its chart is safely on disk.
+                    # (A request past the newest chart returns an older one,
+                    # which says nothing about the requested week.)
+                    journal.write("%s %s\n" % (result.date, result.chart.date))
+                    journal.flush()
+                    os.fsync(journal.fileno())
+        return SyncResult(sorted(added), skipped, errors)
+
+
+ChartPosting = collections.namedtuple(
+    "ChartPosting", ["name", "date", "year", "rank", "title", "artist"]
+)
+ChartPosting.__doc__ = """One chart entry found by ChartIndex.search().
+
+Attributes:
+    name, date, year: The chart the entry is on.
+    rank: The entry's rank on that chart.
+    title, artist: The entry's title and artist, as printed on the chart.
+"""
+
+# Separates the credited artists in names like "Drake Featuring Rihanna"
+_ARTIST_SEPARATOR = re.compile(
+    r"\s+(?:featuring|feat\.?|ft\.?|with|&)\s+|\s*[,/]\s*", re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalize(text):
+    """Returns `text` in the form used to compare titles and artists:
+    lowercase, without accents or punctuation, and with single spaces.
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"['\u2019]", "", text.casefold())
+    return " ".join(re.sub(r"[\W_]+", " ", text).split())
+
+
+def _artistTerms(artist):
+    terms = set([_normalize(artist)])
+    terms.update(_normalize(part) for part in _ARTIST_SEPARATOR.split(artist or ""))
+    terms.discard("")
+    return terms
+
+
+class ChartIndex(object):
+    """An index of chart entries by artist and title.
+
+    Artists and titles are normalized (see search()), and an entry credited
+    to several artists, such as "Drake Featuring Rihanna", is found under
+    each of them as well as under the full credit. Charts can be added at
+    any time, e.g. after each ChartArchive.sync().
+
+    If a `path` is given, the index is also kept in that file: each added
+    chart is appended to it, already normalized, and a later ChartIndex with
+    the same path loads it back without decoding or normalizing any chart.
+    Only the charts that are not in the index yet then need to be added:
+
+        >>> index = billboard.ChartIndex(path='charts/hot-100.index')
+        >>> for date in archive.dates('hot-100'):
+        ...     if not index.contains('hot-100', date):
+        ...         index.add(archive.load('hot-100', date))
+
+    Args:
+        charts: An iterable of ChartData instances to index.
+        path: The file to keep the index in, or None to only keep it in
+            memory.
+    """
+
+    _FIELDS = ("artist", "title")
+
+    def __init__(self, charts=(), path=None):
+        self.path = path
+        self._postings = dict((field, {}) for field in self._FIELDS)
+        # Sorted terms for prefix searches, rebuilt when new terms are added
+        self._sortedTerms = dict((field, None) for field in self._FIELDS)
+        self._charts = set()
+        # Whether the file ends in a line cut short by a crash
+        self._tornLine = False
+        if path is not None:
+            self._load()
+        for chart in charts:
+            self.add(chart)
+
+    def __len__(self):
+        """Returns the number of charts in the index."""
+        return len(self._charts)
+
+    def contains(self, name, date=None, year=None):
+        """Returns whether a chart is in the index."""
+        if date is not None:
+            date = _toDate(date).strftime("%Y-%m-%d")
+        return (name, date, year) in self._charts
+
+    def add(self, chart):
+        """Adds a chart's entries to the index (and to its file, if any).
+
+        Returns:
+            True, or False if the chart was already in the index.
+        """
+        key = (chart.name, chart.date, chart.year)
+        if key in self._charts:
+            return False
+        records = []
+        for entry in chart.entries:
+            titleTerm = _normalize(entry.title)
+            artistTerms = sorted(_artistTerms(entry.artist))
+            records.append(
+                [entry.rank, entry.title, entry.artist, titleTerm, artistTerms]
+            )
+        if self.path is not None:
+            self._append(key, records)
+        self._addRecords(key, records)
+        return True
+
+    def _addRecords(self, key, records):
+        self._charts.add(key)
+        name, date, year = key
+        for rank, title, artist, titleTerm, artistTerms in records:
+            posting = ChartPosting(name, date, year, rank, title, artist)
+            self._addTerm("title", titleTerm, posting)
+            for term in artistTerms:
+                self._addTerm("artist", term, posting)
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                lines = f.read().split(b"\n")
+        except (IOError, OSError):
+            return
+        # The last element is empty unless the file ends in a torn line
+        self._tornLine = lines.pop() != b""
+        for line in lines:
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except ValueError:
+                # A line cut short by a crash; its chart is simply added again
+                continue
+            key = (record["name"], record["date"], record["year"])
+            if key not in self._charts:
+                self._addRecords(key, record["entries"])
+
+    def _append(self, key, records):
+        name, date, year = key
+        record = {"name": name, "date": date, "year": year, "entries": records}
+        line = json.dumps(record, sort_keys=True, separators=(",", ":"))
+        directory = os.path.dirname(self.path)
+        if directory:
+            _makeDirs(directory)
+        with open(self.path, "ab") as f:
+            if self._tornLine:
+                f.write(b"\n")
+                self._tornLine = False
+            f.write(line.encode("utf-8") + b"\n")
+
+    def _addTerm(self, field, term, posting):
+        postings = self._postings[field]
+        if term not in postings:
+            postings[term] = []
+            self._sortedTerms[field] = None
+        postings[term].append(posting)
+
+    def _lookup(self, field, query, prefix):
+        term = _normalize(query)
+        postings = self._postings[field]
+        if not prefix:
+            return set(postings.get(term, ()))
+        terms = self._sortedTerms[field]
+        if terms is None:
+            terms = self._sortedTerms[field] = sorted(postings)
+        found = set()
+        i = bisect.bisect_left(terms, term)
+        while i < len(terms) and terms[i].startswith(term):
+            found.update(postings[terms[i]])
+            i += 1
+        return found
+
+    def search(self, artist=None, title=None, prefix=False):
+        """Finds the chart entries with a given artist and/or title.
+
+        Matching ignores case, accents, punctuation and extra whitespace, so
+        "beyonce" finds "Beyonc\u00e9" and "dont stop" finds "Don't Stop".
+
+        Args:
+            artist: The artist to look for.
+            title: The title to look for. If both are given, an entry must
+                match both.
+            prefix: If True, match every artist or title that starts with
+                the given text, e.g. "the beat" matches "The Beatles".
+
+        Returns:
+            A list of ChartPosting tuples, sorted by chart name, date and
+            rank.
+        """
+        if artist is None and title is None:
+            raise ValueError("artist or title is required")
+        found = None
+        for field, query in (("artist", artist), ("title", title)):
+            if query is not None:
+                matches = self._lookup(field, query, prefix)
+                found = matches if found is None else found & matches
+        return sorted(found, key=lambda p: (p.name, p.date or "", p.year or "", p.rank))
+
+
+ChartMovement = collections.namedtuple(
+    "ChartMovement", ["title", "artist", "rank", "lastRank", "change"]
+)
+ChartMovement.__doc__ = """How one entry moved between two charts, as found by diff().
+
+Attributes:
+    title, artist: The entry's title and artist, as printed on the chart.
+    rank: The entry's rank on the new chart, or None if it dropped out.
+    lastRank: The entry's rank on the old chart, or None if it wasn't on it.
+    change: The number of places the entry climbed (negative if it fell),
+        or None if it is missing from either chart.
+"""
+
+ChartDiff = collections.namedtuple(
+    "ChartDiff",
+    [
+        "oldDate",
+        "newDate",
+        "debuts",
+        "reentries",
+        "dropouts",
+        "climbers",
+        "fallers",
+        "unchanged",
+        "mismatches",
+    ],
+)
+ChartDiff.__doc__ = """The differences between two charts, as found by diff().
+
+Each attribute except the dates is a list of ChartMovement tuples, in order of
+rank on the new chart (or on the old chart, for dropouts).
+
+Attributes:
+    oldDate, newDate: The dates (or years) of the two charts.
+    debuts: Entries that are new to the chart.
+    reentries: Entries that are back on the chart after some time off it.
+    dropouts: Entries that left the chart.
+    climbers, fallers, unchanged: Entries on both charts that moved up,
+        moved down or stayed at the same rank.
+    mismatches: Entries on both charts whose `lastPos` on the new chart
+        disagrees with their rank on the old one, e.g. because Billboard
+        counts a remix as a different track.
+"""
+
+
+def _diffSide(chart):
+    """Returns a chart's entries, their (title, artist) keys, and the
+    position of each key, for diff().
+    """
+    entries = list(chart.entries)
+    keys = [(_normalize(e.title), _normalize(e.artist)) for e in entries]
+    positions = {}
+    for i, key in enumerate(keys):
+        positions.setdefault(key, i)
+    return entries, keys, positions
+
+
+def _areConsecutive(old, new):
+    if not old.date or not new.date:
+        return False
+    days = (_toDate(new.date) - _toDate(old.date)).days
+    return 0 < days <= 7
+
+
+def _diff(old, oldSide, new, newSide):
+    oldEntries, _, oldPositions = oldSide
+    newEntries, newKeys, _ = newSide
+
+    # Match entries by title and artist with one dict lookup each
+    matches = [None] * len(newEntries)
+    matched = set()
+    for i, key in enumerate(newKeys):
+        j = oldPositions.get(key)
+        if j is not None and j not in matched:
+            matches[i] = j
+            matched.add(j)
+
+    # On consecutive charts, lastPos says where each entry was on the old
+    # chart. Use it to check the matches, and to match entries whose title
+    # or artist was spelled differently.
+    mismatches = []
+    if _areConsecutive(old, new):
+        oldByRank = dict((entry.rank, j) for j, entry in enumerate(oldEntries))
+        for i, entry in enumerate(newEntries):
+            if matches[i] is None:
+                j = oldByRank.get(entry.lastPos)
+                if j is not None and j not in matched:
+                    matches[i] = j
+                    matched.add(j)
+            elif entry.lastPos is not None:
+                if entry.lastPos != oldEntries[matches[i]].rank:
+                    mismatches.append(i)
+
+    result = ChartDiff(
+        old.date or old.year, new.date or new.year, [], [], [], [], [], [], []
+    )
+    for i, entry in enumerate(newEntries):
+        j = matches[i]
+        if j is None:
+            movement = ChartMovement(entry.title, entry.artist, entry.rank, None, None)
+            if entry.weeks is not None and entry.weeks > 1:
+                result.reentries.append(movement)
+            else:
+                result.debuts.append(movement)
+            continue
+        lastRank = oldEntries[j].rank
+        change = lastRank - entry.rank
+        movement = ChartMovement(
+            entry.title, entry.artist, entry.rank, lastRank, change
+        )
+        if change > 0:
+            result.climbers.append(movement)
+        elif change < 0:
+            result.fallers.append(movement)
+        else:
+            result.unchanged.append(movement)
+    for i in mismatches:
+        j = matches[i]
+        entry = newEntries[i]
+        lastRank = oldEntries[j].rank
+        result.mismatches.append(
+            ChartMovement(
+                entry.title, entry.artist, entry.rank, lastRank, lastRank - entry.rank
+            )
+        )
+    for j, entry in enumerate(oldEntries):
+        if j not in matched:
+            result.dropouts.append(
+                ChartMovement(entry.title, entry.artist, None, entry.rank, None)
+            )
+    return result
+
+
+def diff(old, new):
+    """Compares two charts, e.g. this week's and last week's.
+
+    Entries are matched by title and artist, ignoring case, accents and
+    punctuation. If the charts are a week (or less) apart, each entry's
+    `lastPos` is also checked against the old chart; it is used to match
+    entries whose title or artist changed, and disagreements are reported
+    in `mismatches`.
+
+    An entry missing from the old chart is a re-entry if the new chart says
+    it has spent more than one week on the chart, and a debut otherwise.
+
+    Args:
+        old: The older ChartData instance.
+        new: The newer ChartData instance.
+
+    Returns:
+        A ChartDiff.
+    """
+    return _diff(old, _diffSide(old), new, _diffSide(new))
+
+
+def diff_series(charts):
+    """Compares each chart in a series with the one before it, e.g. the
+    charts yielded by iter_charts(). Each chart is only indexed once, rather
+    than once per comparison.
+
+    Args:
+        charts: An iterable of ChartData instances, oldest first.
+
+    Returns:
+        A generator of ChartDiff tuples, one per pair of consecutive charts.
+    """
+    previous = previousSide = None
+    for chart in charts:
+        side = _diffSide(chart)
+        if previous is not None:
+            yield _diff(previous, previousSide, chart, side)
+        previous, previousSide = chart, side
+
+
+_defaultParser = "html.parser"
+
+
+def set_default_parser(parser):
+    """Sets the HTML parser (one of PARSERS) used by every ChartData that was
+    not given its own `parser` argument.
+    """
+    global _defaultParser
+    if parser not in PARSERS:
+        raise ValueError("parser must be one of %s" % ", ".join(PARSERS))
+    _defaultParser = parser
+
+
+class _ChartRegionStrainerMixin(object):
+    """Tells BeautifulSoup to only build the elements of a chart page that
+    ChartData reads (with everything inside them), and to skip navigation,
+    scripts, ads and articles.
+    """
+
+    # Tag name -> classes, any of which makes an element worth keeping
+    _WANTED_CLASSES = {
+        "ul": {"o-chart-results-list-row"},
+        "div": {
+            "o-chart-results-list-header__item",
+            "a-chart-o-nav-left",
+            "chart-list-item",
+        },
+        "button": {"chart-detail-header__date-selector-button"},
+    }
+
+    def _wanted(self, name, attrs):
+        attrs = dict(attrs or {})
+        if name == "table" or attrs.get("id") == "chart-date-picker":
+            return True
+        if name == "meta":
+            return attrs.get("property") == "og:title"
+        wantedClasses = self._WANTED_CLASSES.get(name)
+        if not wantedClasses:
+            return False
+        classes = attrs.get("class") or ""
+        if not isinstance(classes, list):
+            classes = classes.split()
+        return not wantedClasses.isdisjoint(classes)
+
+    # For BeautifulSoup >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._wanted(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    # For older versions of BeautifulSoup
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if self._wanted(markup_name, markup_attrs):
+            return markup_name
+        return None
+
+
+def _chartRegionStrainer():
+    """Returns a SoupStrainer that keeps the chart regions of a page."""
+    return _lazySubclass(_ChartRegionStrainerMixin, "bs4", "SoupStrainer")()
+
+
+_ChartRow = collections.namedtuple(
+    "_ChartRow", ["rank", "title", "artist", "image", "cells"]
+)
+_ChartRow.__doc__ = """The raw text of one row of a chart page.
+
+`cells` holds the stripped text of every cell in the row's stats list, or is
+None if the row has no such list.
+"""
+
+_ColumnMap = collections.namedtuple("_ColumnMap", ["last", "peak", "weeks"])
+
+
+def _columnMap(headerTexts):
+    """Returns the positions of the stats within a row's `cells`, given the
+    texts of the page's column headings.
+    """
+    # Some pages do not show an award column in their chart data.
+    # If missing, this changes the column number offsets.
+    hasAwardColumn = any("award" in text.lower() for text in headerTexts)
+    offset = 0 if hasAwardColumn else -1
+    return _ColumnMap(last=3 + offset, peak=4 + offset, weeks=5 + offset)
+
+
+def _cellValue(cells, index, attribute, ifNoValue=None):
+    try:
+        value = cells[index]
+        if value == "-":
+            return ifNoValue
+        else:
+            return int(value)
+    except:
+        message = "Failed to parse metadata value: %s" % attribute
+        raise BillboardParseException(message)
+
+
+class _SoupPage(object):
+    """Reads the parts of a chart page that ChartData needs from a
+    BeautifulSoup tree, walking each chart row only once.
+    """
+
+    def __init__(self, soup):
+        self.soup = soup
+
+    def chartTitle(self):
+        element = self.soup.select_one(_CHART_NAME_SELECTOR)
+        return element.get("content", "") if element else None
+
+    def chartDate(self):
+        element = self.soup.select_one(_CHART_DATE_SELECTOR)
+        return element.get("data-date") if element else None
+
+    def headerTexts(self):
+        return [span.get_text() for span in self.soup.select(_CHART_HEADER_CELLS)]
+
+    def years(self):
+        return [
+            li.get_text().strip() for li in self.soup.select(_YEAR_END_NAV_SELECTOR)
+        ]
+
+    def rows(self):
+        for entrySoup in self.soup.select(_ENTRY_ROW_SELECTOR):
+            lis = entrySoup.find_all("li")
+
+            try:
+                titleElement = lis[3].find(id="title-of-a-story")
+            except:
+                message = "Failed to parse title"
+                raise BillboardParseException(message)
+            title = artist = None
+            if titleElement:
+                title = titleElement.get_text().strip()
+                # Equivalent to "#title-of-a-story + span.c-label"
+                artistElement = titleElement.find_next_sibling()
+                if (
+                    artistElement is not None
+                    and artistElement.name == "span"
+                    and "c-label" in artistElement.get("class", [])
+                ):
+                    artist = artistElement.get_text().strip()
+
+            rankElement = lis[0].find("span", class_="c-label")
+            rank = rankElement.get_text().strip() if rankElement else None
+
+            image = None
+            imageElement = entrySoup.select_one(_ENTRY_ROW_IMAGE_SELECTOR)
+            if imageElement:
+                image = imageElement.get("data-lazy-src", None)
+
+            statsList = entrySoup.find("ul")
+            cells = None
+            if statsList:
+                cells = [li.get_text().strip() for li in statsList.find_all("li")]
+
+            yield _ChartRow(rank, title, artist, image, cells)
+
+
+class _SelectolaxPage(object):
+    """Like _SoupPage, but for a selectolax (Lexbor) tree."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def chartTitle(self):
+        element = self.tree.css_first(_CHART_NAME_SELECTOR)
+        return (element.attributes.get("content") or "") if element else None
+
+    def chartDate(self):
+        element = self.tree.css_first(_CHART_DATE_SELECTOR)
+        return element.attributes.get("data-date") if element else None
+
+    def headerTexts(self):
+        return [span.text() for span in self.tree.css(_CHART_HEADER_CELLS)]
+
+    def years(self):
+        return [li.text().strip() for li in self.tree.css(_YEAR_END_NAV_SELECTOR)]
+
+    def rows(self):
+        for node in self.tree.css(_ENTRY_ROW_SELECTOR):
+            lis = node.css("li")
+
+            def getText(element):
+                return element.text().strip() if element else None
+
+            try:
+                title = getText(lis[3].css_first(_ENTRY_ROW_TITLE_SELECTOR))
+                artist = getText(lis[3].css_first(_ENTRY_ROW_ARTIST_SELECTOR))
+            except:
+                message = "Failed to parse title"
+                raise BillboardParseException(message)
+            rank = getText(lis[0].css_first("span.c-label"))
+
+            imageElement = node.css_first(_ENTRY_ROW_IMAGE_SELECTOR)
+            image = (
+                imageElement.attributes.get("data-lazy-src") if imageElement else None
+            )
+
+            # Unlike BeautifulSoup's select(), Lexbor's css() also matches the
+            # node itself, so skip the row to find the first nested list
+            cells = None
+            for statsList in node.css("ul"):
+                if statsList != node:
+                    cells = [li.text().strip() for li in statsList.css("li")]
+                    break
+
+            yield _ChartRow(rank, title, artist, image, cells)
+
+
+def _selectolaxTree(html):
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        raise ImportError('The "selectolax" parser requires selectolax to be installed')
+    return LexborHTMLParser(html)
+
+
+# The binary chart format written by ChartData.to_bytes():
+#
+#   header        magic, format version, length of the attributes
+#   attributes    the chart's attributes (except entries), as compact JSON
+#   strings       a count, then the UTF-8 length of every string, then the
+#                 strings themselves. Entries refer to strings by position,
+#                 starting from 1; 0 stands for None.
+#   entries       a count, then one fixed-size record per entry. Missing
+#                 numbers are stored as -1.
+#
+# Bump _CHART_FORMAT_VERSION whenever the layout changes.
+_CHART_FORMAT_MAGIC = b"BBCD"
+_CHART_FORMAT_VERSION = 1
+_CHART_HEADER = struct.Struct("<4sBI")
+_COUNT = struct.Struct("<I")
+_ENTRY_RECORD = struct.Struct("<IIIiiiiB")
+
+
+def _encodeChart(chart):
+    attrs = chart._toDict()
+    del attrs["entries"]
+    # Sorted, like json(), so that the payload doesn't depend on the order in
+    # which the attributes were set
+    attrsBlob = json.dumps(
+        attrs, separators=(",", ":"), sort_keys=True, default=str
+    ).encode("utf-8")
+
+    strings = []
+    stringIds = {None: 0}
+
+    def stringId(value):
+        try:
+            return stringIds[value]
+        except KeyError:
+            stringIds[value] = len(strings) + 1
+            strings.append(value.encode("utf-8"))
+            return stringIds[value]
+
+    def number(value):
+        return -1 if value is None else value
+
+    records = []
+    for entry in chart.entries:
+        records.append(
+            _ENTRY_RECORD.pack(
+                stringId(entry.title),
+                stringId(entry.artist),
+                stringId(entry.image),
+                number(entry.rank),
+                number(getattr(entry, "peakPos", None)),
+                number(getattr(entry, "lastPos", None)),
+                number(getattr(entry, "weeks", None)),
+                1 if getattr(entry, "isNew", False) else 0,
+            )
+        )
+
+    return b"".join(
+        [
+            _CHART_HEADER.pack(
+                _CHART_FORMAT_MAGIC, _CHART_FORMAT_VERSION, len(attrsBlob)
+            ),
+            attrsBlob,
+            _COUNT.pack(len(strings)),
+            struct.pack("<%dI" % len(strings), *[len(b) for b in strings]),
+            b"".join(strings),
+            _COUNT.pack(len(records)),
+            b"".join(records),
+        ]
+    )
+
+
+def _isCurrentChartFormat(payload):
+    """Returns whether the payload was encoded by this version's _encodeChart."""
+    header = bytes(payload[: _CHART_HEADER.size])
+    if len(header) < _CHART_HEADER.size:
+        return False
+    magic, version, _ = _CHART_HEADER.unpack(header)
+    return magic == _CHART_FORMAT_MAGIC and version == _CHART_FORMAT_VERSION
+
+
+def _decodeChart(payload):
+    """Returns the attributes and entries of a chart encoded by _encodeChart."""
+    try:
+        magic, version, attrsLength = _CHART_HEADER.unpack_from(payload, 0)
+    except struct.error:
+        raise ValueError("Not a billboard.py chart")
+    if magic != _CHART_FORMAT_MAGIC:
+        raise ValueError("Not a billboard.py chart")
+    if version != _CHART_FORMAT_VERSION:
+        raise ValueError("Unsupported chart format version: %d" % version)
+
+    offset = _CHART_HEADER.size
+    attrs = json.loads(payload[offset : offset + attrsLength].decode("utf-8"))
+    offset += attrsLength
+
+    (stringCount,) = _COUNT.unpack_from(payload, offset)
+    offset += _COUNT.size
+    lengths = struct.unpack_from("<%dI" % stringCount, payload, offset)
+    offset += 4 * stringCount
+    strings = [None]
+    for length in lengths:
+        strings.append(_intern(payload[offset : offset + length].decode("utf-8")))
+        offset += length
+
+    (entryCount,) = _COUNT.unpack_from(payload, offset)
+    offset += _COUNT.size
+    records = _ENTRY_RECORD.iter_unpack(
+        payload[offset : offset + entryCount * _ENTRY_RECORD.size]
+    )
+
+    def number(value):
+        return None if value == -1 else value
+
+    entries = []
+    if attrs.get("year"):
+        for title, artist, image, rank, _, _, _, _ in records:
+            entries.append(
+                YearEndChartEntry(
+                    strings[title], strings[artist], strings[image], number(rank)
+                )
+            )
+    else:
+        for title, artist, image, rank, peakPos, lastPos, weeks, isNew in records:
+            entries.append(
+                ChartEntry(
+                    strings[title],
+                    strings[artist],
+                    strings[image],
+                    number(peakPos),
+                    number(lastPos),
+                    number(weeks),
+                    number(rank),
+                    bool(isNew),
+                )
+            )
+    return attrs, entries
+
+
+class _StringDictionary(object):
+    """Dictionary-encodes a column of strings: each distinct string is kept
+    once in `values`, and `codes` holds its position (or None) for every row.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.codes = []
+        self._positions = {None: None}
+
+    def add(self, value, count=1):
+        try:
+            code = self._positions[value]
+        except KeyError:
+            code = self._positions[value] = len(self.values)
+            self.values.append(value)
+        if count == 1:
+            self.codes.append(code)
+        else:
+            self.codes.extend([code] * count)
+
+    def extend(self, values):
+        for value in values:
+            self.add(value)
+
+
+# The columns of to_arrow() and to_numpy(), in order
+_TABLE_STRING_COLUMNS = ("name", "date", "year", "title", "artist")
+_TABLE_NUMBER_COLUMNS = ("rank", "peakPos", "lastPos", "weeks")
+
+
+def _collectColumns(charts):
+    """Gathers the entries of many charts into columns, in one pass."""
+    strings = {column: _StringDictionary() for column in _TABLE_STRING_COLUMNS}
+    numbers = {column: [] for column in _TABLE_NUMBER_COLUMNS}
+    isNew = []
+
+    def unpack(values):
+        return [None if value == ChartEntryColumns._NONE else value for value in values]
+
+    for chart in charts:
+        entries = chart.entries
+        count = len(entries)
+        strings["name"].add(chart.name, count)
+        strings["date"].add(None if chart.year else chart.date, count)
+        strings["year"].add(str(chart.year) if chart.year else None, count)
+
+        if isinstance(entries, ChartEntryColumns):
+            # Read the columns directly, without building entry objects
+            strings["title"].extend(entries.titles)
+            strings["artist"].extend(entries.artists)
+            numbers["rank"].extend(unpack(entries.ranks))
+            if entries.yearEnd:
+                for column in ("peakPos", "lastPos", "weeks"):
+                    numbers[column].extend([None] * count)
+                isNew.extend([None] * count)
+            else:
+                numbers["peakPos"].extend(unpack(entries.peakPositions))
+                numbers["lastPos"].extend(unpack(entries.lastPositions))
+                numbers["weeks"].extend(unpack(entries.weeks))
+                isNew.extend(bool(value) for value in entries.isNew)
+            continue
+
+        for entry in entries:
+            strings["title"].add(entry.title)
+            strings["artist"].add(entry.artist)
+            numbers["rank"].append(entry.rank)
+            numbers["peakPos"].append(getattr(entry, "peakPos", None))
+            numbers["lastPos"].append(getattr(entry, "lastPos", None))
+            numbers["weeks"].append(getattr(entry, "weeks", None))
+            isNew.append(getattr(entry, "isNew", None))
+
+    return strings, numbers, isNew
+
+
+def to_arrow(charts):
+    """Returns the entries of many charts as one pyarrow.Table, with a row
+    per entry and the columns name, date, year, title, artist, rank, peakPos,
+    lastPos, weeks and isNew.
+
+    String columns are dictionary-encoded, so repeated chart names, dates,
+    titles and artists are only stored once. Missing values are null.
+    Requires pyarrow.
+    """
+    import pyarrow
+
+    strings, numbers, isNew = _collectColumns(charts)
+    columns = {}
+    for column in _TABLE_STRING_COLUMNS:
+        columns[column] = pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(strings[column].codes, type=pyarrow.int32()),
+            pyarrow.array(strings[column].values, type=pyarrow.string()),
+        )
+    for column in _TABLE_NUMBER_COLUMNS:
+        columns[column] = pyarrow.array(numbers[column], type=pyarrow.int32())
+    columns["isNew"] = pyarrow.array(isNew, type=pyarrow.bool_())
+    return pyarrow.table(columns)
+
+
+def to_parquet(charts, path, **kwargs):
+    """Writes the entries of many charts to a Parquet file, with the columns
+    of to_arrow(). Any keyword arguments are passed on to
+    pyarrow.parquet.write_table(). Requires pyarrow.
+    """
+    import pyarrow.parquet
+
+    pyarrow.parquet.write_table(to_arrow(charts), path, **kwargs)
+
+
+def to_numpy(charts):
+    """Returns the entries of many charts as one numpy.recarray, with the
+    columns of to_arrow().
+
+    String columns are object arrays in which equal strings share a single
+    Python object. Missing numbers are -1, and a missing isNew is False.
+    Requires NumPy.
+    """
+    import numpy
+
+    strings, numbers, isNew = _collectColumns(charts)
+    columns = []
+    for column in _TABLE_STRING_COLUMNS:
+        dictionary = numpy.array(strings[column].values + [None], dtype=object)
+        # A code of -1 picks the trailing None
+        codes = numpy.array(
+            [-1 if code is None else code for code in strings[column].codes],
+            dtype=numpy.int32,
+        )
+        columns.append((column, dictionary[codes]))
+    for column in _TABLE_NUMBER_COLUMNS:
+        values = [-1 if value is None else value for value in numbers[column]]
+        columns.append((column, numpy.array(values, dtype=numpy.int32)))
+    columns.append(("isNew", numpy.array([bool(value) for value in isNew])))
+
+    return numpy.rec.fromarrays(
+        [values for _, values in columns], names=[name for name, _ in columns]
+    )
+
+
+_Validated = collections.namedtuple("_Validated", ["headers", "payload"])
+
+
+class ValidatorStore(object):
+    """Remembers the validators (the ETag and Last-Modified headers) sent
+    with the current charts, along with the chart parsed from each response.
+
+    ChartData.fetchEntries() uses them to make conditional requests for
+    current charts. If Billboard answers that the page has not changed (304
+    Not Modified), the chart is rebuilt from the stored copy, without
+    downloading or parsing the page again.
+
+    Attributes:
+        max_charts: The max number of charts to remember. The least recently
+            used charts are forgotten first.
+        saved: The number of fetches answered with 304 Not Modified.
+    """
+
+    def __init__(self, max_charts=256):
+        self.max_charts = max_charts
+        self.saved = 0
+        self._validated = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """Returns the conditional request headers and the chart (as bytes)
+        stored for `url`, or None.
+        """
+        with self._lock:
+            validated = self._validated.get(url)
+            if validated is not None:
+                self._validated.move_to_end(url)
+            return validated
+
+    def set(self, url, responseHeaders, payload):
+        """Stores the validators from a response's headers, and the chart
+        parsed from it (as bytes). Responses without validators are ignored.
+        """
+        headers = {}
+        if responseHeaders.get("ETag"):
+            headers["If-None-Match"] = responseHeaders["ETag"]
+        if responseHeaders.get("Last-Modified"):
+            headers["If-Modified-Since"] = responseHeaders["Last-Modified"]
+        with self._lock:
+            if not headers:
+                self._validated.pop(url, None)
+                return
+            self._validated[url] = _Validated(headers, payload)
+            self._validated.move_to_end(url)
+            while len(self._validated) > self.max_charts:
+                self._validated.popitem(last=False)
+
+    def recordNotModified(self):
+        with self._lock:
+            self.saved += 1
+
+    def clear(self):
+        with self._lock:
+            self._validated.clear()
+
+
+_defaultValidatorStore = ValidatorStore()
+
+
+def set_default_validator_store(store):
+    """Sets the ValidatorStore used for conditional requests for current
+    charts. Pass None to always download current charts in full.
+    """
+    global _defaultValidatorStore
+    _defaultValidatorStore = store
+
+
+_ChartCalendar = collections.namedtuple("_ChartCalendar", ["dates", "reach"])
+
+
+class PublicationCalendar(object):
+    """Learns the dates on which each chart is published, so that a requested
+    date can be replaced by a canonical date before the chart is fetched.
+
+    Billboard rounds every date up to the next date on which the chart was
+    published, so e.g. 2020-01-01 and 2020-01-04 give the same Hot 100. Once
+    the calendar knows that, both are fetched (and cached) as 2020-01-04, so
+    with a chart cache, the page is only downloaded once.
+
+    A calendar is only used when it is passed to ChartData (or set with
+    set_default_calendar()). It learns from every chart that is fetched with
+    it: the chart's date is a publication date, and no chart was published
+    between the requested date and that date. Between two known publication
+    dates at most `max_gap` weeks apart, on the same weekday, the chart is
+    assumed to be published weekly on that weekday. Dates after the newest
+    known chart are never changed.
+
+    Attributes:
+        max_gap: The longest gap, in weeks, between two known publication
+            dates across which the weekly rule is applied.
+        hits: The number of requested dates that were replaced by a
+            different, canonical date.
+    """
+
+    def __init__(self, max_gap=26):
+        self.max_gap = max_gap
+        self.hits = 0
+        self._charts = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, dates):
+        """Adds known publication dates (as YYYY-MM-DD strings or dates) of
+        a chart, e.g. the dates held in a ChartArchive.
+        """
+        for date in dates:
+            self._record(name, None, date)
+
+    def dates(self, name):
+        """Returns the known publication dates of a chart, in order."""
+        with self._lock:
+            chart = self._charts.get(name)
+            dates = list(chart.dates) if chart is not None else []
+        return [date.strftime("%Y-%m-%d") for date in dates]
+
+    def canonical(self, name, date):
+        """Returns the canonical date (as YYYY-MM-DD) for a requested chart
+        date: the date of the chart that Billboard gives for it, or a date
+        for which Billboard gives the same chart. Returns None if this isn't
+        known.
+        """
+        date = _toDate(date)
+        with self._lock:
+            chart = self._charts.get(name)
+            if chart is None:
+                return None
+            i = bisect.bisect_left(chart.dates, date)
+            if i == len(chart.dates):
+                return None
+            nextDate = chart.dates[i]
+            if chart.reach.get(nextDate, nextDate) <= date:
+                canonicalDate = nextDate
+            else:
+                if i == 0:
+                    return None
+                previousDate = chart.dates[i - 1]
+                gap = (nextDate - previousDate).days
+                if gap % 7 or gap > self.max_gap * 7:
+                    return None
+                weeks = -(-(date - previousDate).days // 7)
+                canonicalDate = previousDate + datetime.timedelta(weeks=weeks)
+            if canonicalDate != date:
+                self.hits += 1
+        return canonicalDate.strftime("%Y-%m-%d")
+
+    def _record(self, name, requestedDate, chartDate):
+        """Records that `chartDate` is a publication date, and that
+        Billboard gave it for `requestedDate` (if not None).
+        """
+        chartDate = _toDate(chartDate)
+        if requestedDate is not None:
+            requestedDate = _toDate(requestedDate)
+        with self._lock:
+            chart = self._charts.get(name)
+            if chart is None:
+                chart = self._charts[name] = _ChartCalendar([], {})
+            i = bisect.bisect_left(chart.dates, chartDate)
+            if i == len(chart.dates) or chart.dates[i] != chartDate:
+                chart.dates.insert(i, chartDate)
+            if requestedDate is not None and requestedDate < chart.reach.get(
+                chartDate, chartDate
+            ):
+                chart.reach[chartDate] = requestedDate
+
+    def clear(self):
+        with self._lock:
+            self._charts.clear()
+
+
+_defaultCalendar = None
+
+
+def set_default_calendar(calendar):
+    """Sets a PublicationCalendar to be used by every ChartData that isn't
+    given one. Pass None (the default) to fetch charts by the requested date.
+    """
+    global _defaultCalendar
+    _defaultCalendar = calendar
+
+
+_CURRENT_CHART_KEY = "current"
+
+_defaultCache = None
+
+
+def _cacheKey(date, year):
+    if year:
+        return "year-end/%s" % year
+    if date:
+        return str(date)
+    return _CURRENT_CHART_KEY
+
+
+def set_default_cache(cache):
+    """Sets the ChartCache used by every ChartData that was not given its own
+    `cache` argument. Pass None to disable caching.
+    """
+    global _defaultCache
+    _defaultCache = cache
+
+
+def _cliQueries(names, since, until, step, years):
+    """Yields the fetch_many() queries for the command-line tool."""
+    for name in names:
+        if years:
+            for year in range(years[0], years[-1] + 1):
+                yield (name, str(year))
+        elif since is None:
+            yield name
+        else:
+            # Billboard rounds each date up to the chart of its week
+            date = since
+            while date <= until:
+                yield (name, date.strftime("%Y-%m-%d"))
+                date += datetime.timedelta(weeks=step)
+
+
+def main(argv=None):
+    """The `billboard` command: fetches charts and writes each one to stdout
+    as a line of JSON (NDJSON), in the format of ChartData.json(), as soon as
+    it is parsed. Returns the exit status.
+    """
+
+    def date(value):
+        return _toDate(value)
+
+    argParser = argparse.ArgumentParser(
+        prog="billboard",
+        description="Download Billboard charts as newline-delimited JSON.",
+    )
+    argParser.add_argument("charts", nargs="+", metavar="CHART", help="chart names")
+    argParser.add_argument(
+        "--since", type=date, metavar="YYYY-MM-DD", help="first week to fetch"
+    )
+    argParser.add_argument(
+        "--until",
+        type=date,
+        metavar="YYYY-MM-DD",
+        help="last week to fetch (default: today)",
+    )
+    argParser.add_argument(
+        "--step", type=int, default=1, metavar="N", help="fetch every Nth week"
+    )
+    argParser.add_argument(
+        "--years",
+        type=int,
+        nargs="+",
+        metavar="YYYY",
+        help="fetch the year-end charts of a year, or of FIRST LAST and every "
+        "year in between",
+    )
+    argParser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        metavar="N",
+        help="number of charts to fetch at the same time (default: 8)",
+    )
+    argParser.add_argument(
+        "--parse-processes",
+        type=int,
+        metavar="N",
+        help="parse pages on N worker processes (e.g. one per CPU core)",
+    )
+    argParser.add_argument(
+        "--rate-limit",
+        type=float,
+        metavar="N",
+        help="max number of charts to start fetching per second (0 for no limit)",
+    )
+    argParser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="write charts in the order they were requested",
+    )
+    argParser.add_argument("--parser", choices=PARSERS, help="HTML parser to use")
+    argParser.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        metavar="N",
+        help="max number of times to retry a failed request (default: 5)",
+    )
+    argParser.add_argument(
+        "--timeout",
+        type=float,
+        default=25,
+        metavar="SECONDS",
+        help="request timeout (default: 25)",
+    )
+    args = argParser.parse_args(argv)
+
+    if args.years and (len(args.years) > 2 or args.since or args.until):
+        argParser.error("--years takes FIRST [LAST] and no --since or --until")
+    if args.until and not args.since:
+        argParser.error("--until requires --since")
+    if args.step < 1 or args.workers < 1:
+        argParser.error("--step and --workers must be positive")
+    until = args.until or datetime.date.today()
+
+    results = fetch_many(
+        _cliQueries(args.charts, args.since, until, args.step, args.years),
+        max_workers=args.workers,
+        rate_limit=args.rate_limit,
+        ordered=args.ordered,
+        parse_processes=args.parse_processes,
+        max_retries=args.max_retries,
+        timeout=args.timeout,
+        parser=args.parser,
+    )
+    # Two requested dates in the same week give the same chart
+    written = set()
+    failed = 0
+    try:
+        for result in results:
+            if result.error is not None:
+                failed += 1
+                sys.stderr.write(
+                    "billboard: %s %s: %s\n"
+                    % (result.name, result.date or result.year or "", result.error)
+                )
+                continue
+            chart = result.chart
+            key = (chart.name, chart.date, chart.year)
+            if key in written:
+                continue
+            written.add(key)
+            sys.stdout.write(json.dumps(chart._toDict(), sort_keys=True) + "\n")
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `billboard ... | head`)
+        results.close()
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,4 @@
 import sys
-import time
 
 import billboard
 import spotipy
@@ -15,27 +14,31 @@ PLAYLIST_NAME = 'Best of the Hot 100'
 TRACK_COUNT   = 100
 CHART         = 'hot-100'
 START_DATE    = None  # None for default (latest chart)
-THROTTLE_TIME = 0.50  # Seconds
+END_DATE      = '1958-08-04'  # The first Hot 100
+PREFETCH      = 4  # Charts to download ahead
 
 
 def unique_top_tracks_generator():
     seen_tracks = set()
-    chart = billboard.ChartData(CHART, date=START_DATE)
+    start_date = START_DATE or billboard.ChartData(CHART).date
 
-    while len(seen_tracks) < TRACK_COUNT:
+    # Walk back through the chart history, newest first
+    for chart in billboard.iter_charts(CHART, start_date, END_DATE, prefetch=PREFETCH):
         top_track = chart[0]
-        duplicate = top_track.spotifyLink in seen_tracks
+        key = (top_track.title, top_track.artist)
 
-        if not duplicate:
-            seen_tracks.add(top_track.spotifyLink)
+        if key not in seen_tracks:
+            seen_tracks.add(key)
             yield top_track
 
-        if not chart.previousDate:
+        if len(seen_tracks) >= TRACK_COUNT:
             break
-        time.sleep(THROTTLE_TIME)
-        chart = billboard.ChartData(CHART, date=chart.previousDate)
 
-    raise StopIteration
+
+def find_track_uri(sp, track):
+    query = 'track:%s artist:%s' % (track.title, track.artist)
+    items = sp.search(q=query, type='track', limit=1)['tracks']['items']
+    return items[0]['uri'] if items else None
 
 
 def main():
@@ -53,12 +56,13 @@ def main():
     playlist_id = playlist[u'id']
 
     for track in unique_top_tracks_generator():
-        print track
-        url = track.spotifyLink
+        print(track)
         try:
-            sp.user_playlist_add_tracks(SPOTIFY_USERNAME, playlist_id, [url])
+            uri = find_track_uri(sp, track)
+            if uri:
+                sp.user_playlist_add_tracks(SPOTIFY_USERNAME, playlist_id, [uri])
         except Exception as e:
-            print e
+            print(e)
 
 
 if __name__ == '__main__':
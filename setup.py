@@ -15,6 +15,15 @@ setup(
     author_email="guoguo12@gmail.com",
     url="https://github.com/guoguo12/billboard-charts",
     py_modules=["billboard"],
+    entry_points={"console_scripts": ["billboard = billboard:main"]},
     license="MIT License",
+    python_requires=">=3.7",
     install_requires=["beautifulsoup4 >= 4.4.1", "requests >= 2.2.1"],
+    extras_require={
+        "async": ["aiohttp >= 3.0"],
+        "lxml": ["lxml"],
+        "selectolax": ["selectolax >= 0.3.12"],
+        "arrow": ["pyarrow"],
+        "numpy": ["numpy"],
+    },
 )
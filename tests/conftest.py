@@ -0,0 +1,23 @@
+import billboard
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cassette",
+        metavar="PATH",
+        help="Replay Billboard.com responses from a cassette directory.",
+    )
+    parser.addoption(
+        "--cassette-mode",
+        default="replay",
+        choices=["replay", "record", "auto"],
+        help="How the cassette is used (see billboard.CassetteAdapter).",
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("--cassette")
+    if path:
+        billboard.configure_session(
+            cassette=path, cassette_mode=config.getoption("--cassette-mode")
+        )
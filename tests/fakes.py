@@ -0,0 +1,138 @@
+"""Offline stand-ins for Billboard.com, used by tests that should not touch
+the network.
+"""
+
+import os
+import re
+
+import requests
+
+testDir = os.path.dirname(os.path.realpath(__file__))
+
+
+def readFixture(filename):
+    with open(os.path.join(testDir, filename)) as f:
+        return f.read()
+
+
+class FakeResponse(object):
+    def __init__(self, text, status_code=200, headers=None):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError("%d error" % self.status_code)
+
+    def close(self):
+        pass
+
+
+class FakeSession(object):
+    """Serves fixture pages by URL path (e.g. "/charts/hot-100/1979-08-04")
+    and records every requested URL in `requested`.
+
+    If `etag` is given, pages are sent with that ETag, and requests that
+    already have it get an empty 304 Not Modified response.
+    """
+
+    def __init__(self, pages, etag=None):
+        self.pages = pages
+        self.etag = etag
+        self.requested = []
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        self.requested.append(url)
+        path = url.split("billboard.com", 1)[-1]
+        if path not in self.pages:
+            return FakeResponse("", status_code=404)
+        if self.etag is None:
+            return FakeResponse(readFixture(self.pages[path]))
+        responseHeaders = {"ETag": self.etag}
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse("", status_code=304, headers=responseHeaders)
+        return FakeResponse(readFixture(self.pages[path]), headers=responseHeaders)
+
+
+class FixtureAdapter(requests.adapters.BaseAdapter):
+    """A requests transport adapter that serves fixture pages by URL path,
+    like FakeSession, and records every requested URL in `requested`.
+    """
+
+    def __init__(self, pages, etag=None):
+        super(FixtureAdapter, self).__init__()
+        self.session = FakeSession(pages, etag=etag)
+        self.requested = self.session.requested
+
+    def send(self, request, **kwargs):
+        fake = self.session.get(request.url, headers=request.headers)
+        response = requests.models.Response()
+        response.status_code = fake.status_code
+        response.headers = requests.structures.CaseInsensitiveDict(fake.headers)
+        response._content = fake.content
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class FakeAsyncResponse(object):
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excInfo):
+        return False
+
+    def raise_for_status(self):
+        self._response.raise_for_status()
+
+    async def text(self):
+        return self._response.text
+
+
+class FakeAsyncSession(FakeSession):
+    """Like FakeSession, but with the interface of an aiohttp.ClientSession."""
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        return FakeAsyncResponse(
+            super(FakeAsyncSession, self).get(url, headers=headers)
+        )
+
+
+class PublicationSession(FakeSession):
+    """Serves one fixture page for a chart at every date, rounding each
+    requested date up to the next of `publicationDates` like Billboard.com
+    does.
+    """
+
+    def __init__(self, name, filename, publicationDates):
+        super(PublicationSession, self).__init__({})
+        self.name = name
+        self.html = readFixture(filename)
+        self.publicationDates = sorted(publicationDates)
+
+    def get(self, url, timeout=None, **kwargs):
+        self.requested.append(url)
+        prefix = "https://www.billboard.com/charts/%s" % self.name
+        if not url.startswith(prefix):
+            return FakeResponse("", status_code=404)
+        requestedDate = url[len(prefix) + 1 :] or self.publicationDates[-1]
+        dates = [d for d in self.publicationDates if d >= requestedDate]
+        date = dates[0] if dates else self.publicationDates[-1]
+        html = re.sub(r'data-date="[^"]*"', 'data-date="%s"' % date, self.html)
+        return FakeResponse(html)
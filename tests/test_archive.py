@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import billboard
+from fakes import FakeSession, PublicationSession
+
+# Saturdays with no chart on 1979-07-28, then a switch to Tuesdays
+DATES = ["1979-07-14", "1979-07-21", "1979-08-04", "1979-08-07"]
+
+
+class ChartArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.archive = billboard.ChartArchive(self.path)
+        self.session = PublicationSession("hot-100", "1979-08-04-hot-100.html", DATES)
+
+    def sync(self, since="1979-07-10", until="1979-08-10", **kwargs):
+        return self.archive.sync(
+            "hot-100", since=since, until=until, session=self.session, **kwargs
+        )
+
+    def testSync(self):
+        result = self.sync()
+        self.assertEqual(result.stored, DATES)
+        self.assertEqual(result.skipped, 0)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(self.archive.dates("hot-100"), DATES)
+
+        chart = self.archive.load("hot-100", "1979-08-07")
+        self.assertEqual(chart.date, "1979-08-07")
+        self.assertEqual(len(chart), 100)
+        self.assertEqual(chart[0].title, "Bad Girls")
+        self.assertEqual([c.date for c in self.archive.charts("hot-100")], DATES)
+
+    def testIncremental(self):
+        """Checks that archived weeks and weeks with no chart are not fetched
+        again.
+        """
+        self.sync()
+        self.session.requested = []
+        result = self.sync()
+        self.assertEqual(result.stored, [])
+        self.assertEqual(result.skipped, 5)
+        self.assertEqual(self.session.requested, [])
+
+    def testResume(self):
+        """Checks that only the weeks lost in an interrupted sync are fetched."""
+        self.sync()
+        os.remove(os.path.join(self.path, "hot-100", "1979-07-21.chart"))
+        with open(os.path.join(self.path, "hot-100", "sync.journal"), "a") as f:
+            f.write("1979-08-")
+        self.session.requested = []
+        result = self.sync()
+        self.assertEqual(result.stored, ["1979-07-21"])
+        self.assertEqual(
+            self.session.requested,
+            ["https://www.billboard.com/charts/hot-100/1979-07-17"],
+        )
+
+    def testSinceLastChart(self):
+        """Checks that `since` defaults to the day after the newest chart."""
+        self.assertRaises(ValueError, self.archive.sync, "hot-100")
+        self.sync()
+        self.session.publicationDates.append("1979-08-14")
+        self.session.requested = []
+        result = self.sync(since=None, until="1979-08-14")
+        self.assertEqual(result.stored, ["1979-08-14"])
+        self.assertEqual(len(self.session.requested), 1)
+
+    def testErrors(self):
+        """Checks that failed weeks are reported and retried by the next sync."""
+        result = self.archive.sync(
+            "hot-100", since="1979-07-10", until="1979-07-20", session=FakeSession({})
+        )
+        self.assertEqual(len(result.errors), 2)
+        self.assertEqual(self.archive.dates("hot-100"), [])
+        result = self.sync(until="1979-07-20")
+        self.assertEqual(result.stored, DATES[:2])
+
+    def testMissingChart(self):
+        self.assertEqual(self.archive.dates("hot-100"), [])
+        self.assertRaises(
+            billboard.BillboardNotFoundException,
+            self.archive.load,
+            "hot-100",
+            "1979-08-04",
+        )
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import unittest
+
+import billboard
+from fakes import FakeAsyncSession, FakeSession
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+PAGES = {"/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html"}
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class AsyncChartDataTest(unittest.TestCase):
+    def testMatchesChartData(self):
+        """Checks that AsyncChartData parses charts exactly like ChartData."""
+        session = FakeAsyncSession(PAGES)
+        chart = asyncio.run(
+            billboard.AsyncChartData.fetch(
+                "hot-100", date="1979-08-04", session=session
+            )
+        )
+        reference = billboard.ChartData(
+            "hot-100", date="1979-08-04", session=FakeSession(PAGES)
+        )
+        self.assertEqual(json.loads(chart.json()), json.loads(reference.json()))
+
+    def testNotFound(self):
+        """Checks that a missing chart raises BillboardNotFoundException."""
+        session = FakeAsyncSession(PAGES)
+        coroutine = billboard.AsyncChartData.fetch("does-not-exist", session=session)
+        self.assertRaises(billboard.BillboardNotFoundException, asyncio.run, coroutine)
+
+    def testConcurrentFetches(self):
+        """Checks that many charts can be fetched on one event loop."""
+        session = FakeAsyncSession(PAGES)
+
+        async def fetchAll():
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(
+                *[
+                    billboard.AsyncChartData.fetch(
+                        "hot-100",
+                        date="1979-08-04",
+                        session=session,
+                        semaphore=semaphore,
+                    )
+                    for _ in range(3)
+                ]
+            )
+
+        charts = asyncio.run(fetchAll())
+        self.assertEqual([len(chart) for chart in charts], [100, 100, 100])
+        self.assertEqual(len(session.requested), 3)
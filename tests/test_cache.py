@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import billboard
+from fakes import FakeResponse, FakeSession, PublicationSession
+
+HOT_100_1979 = {"/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html"}
+
+
+class Base:
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.cache = self.makeCache()
+        self.session = FakeSession(HOT_100_1979)
+        patcher = mock.patch.object(
+            billboard, "_get_session_with_retries", return_value=self.session
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def testMissThenHit(self):
+        """Checks that a cached chart is rebuilt without a second request."""
+        first = billboard.ChartData("hot-100", date="1979-08-04", cache=self.cache)
+        second = billboard.ChartData("hot-100", date="1979-08-04", cache=self.cache)
+        self.assertEqual(len(self.session.requested), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(json.loads(first.json()), json.loads(second.json()))
+        self.assertIsInstance(second[0], billboard.ChartEntry)
+        self.assertEqual(second[0].title, "Bad Girls")
+
+    def testCurrentChartExpires(self):
+        """Checks that the current chart is only cached for `current_ttl`."""
+        self.cache.current_ttl = 60
+        payload = billboard.ChartData("hot-100", fetch=False).to_bytes()
+        self.cache.set("hot-100", payload)
+        self.assertIsNotNone(self.cache.get("hot-100"))
+        with mock.patch.object(time, "time", return_value=time.time() + 120):
+            self.assertIsNone(self.cache.get("hot-100"))
+
+    def testOldFormatIsRefetched(self):
+        """Checks that entries in an older format are fetched again."""
+        self.cache.set("hot-100", b'{"entries": []}', date="1979-08-04")
+        chart = billboard.ChartData("hot-100", date="1979-08-04", cache=self.cache)
+        self.assertEqual(len(self.session.requested), 1)
+        self.assertEqual(chart[0].title, "Bad Girls")
+        payload = self.cache.get("hot-100", date="1979-08-04")
+        self.assertEqual(billboard.ChartData.from_bytes(payload)[0].title, "Bad Girls")
+
+    def testFutureDateIsNotCached(self):
+        """Checks that a chart returned for a date after it isn't cached under
+        that date, so the chart published on it is fetched later.
+        """
+        session = PublicationSession(
+            "hot-100", "1979-08-04-hot-100.html", ["1979-07-28"]
+        )
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-04", cache=self.cache, session=session
+        )
+        self.assertEqual(chart.date, "1979-07-28")
+        session.publicationDates.append("1979-08-04")
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-04", cache=self.cache, session=session
+        )
+        self.assertEqual(chart.date, "1979-08-04")
+        self.assertEqual(len(session.requested), 2)
+        chart = billboard.ChartData(
+            "hot-100", date="1979-07-28", cache=self.cache, session=session
+        )
+        self.assertEqual(len(session.requested), 2)
+
+    def testEmptyChartIsNotCached(self):
+        with mock.patch.object(
+            self.session, "get", return_value=FakeResponse("<html></html>")
+        ) as get:
+            for _ in range(2):
+                chart = billboard.ChartData(
+                    "hot-100", date="1979-08-04", cache=self.cache
+                )
+                self.assertEqual(len(chart), 0)
+        self.assertEqual(get.call_count, 2)
+        self.assertIsNone(self.cache.get("hot-100", date="1979-08-04"))
+
+    def testDefaultCache(self):
+        """Checks that the module-wide cache is used when none is given."""
+        billboard.set_default_cache(self.cache)
+        self.addCleanup(billboard.set_default_cache, None)
+        billboard.ChartData("hot-100", date="1979-08-04")
+        billboard.ChartData("hot-100", date="1979-08-04")
+        self.assertEqual(len(self.session.requested), 1)
+
+
+class TestDirectoryChartCache(Base, unittest.TestCase):
+    def makeCache(self):
+        return billboard.DirectoryChartCache(self.tempDir)
+
+
+class TestSQLiteChartCache(Base, unittest.TestCase):
+    def makeCache(self):
+        cache = billboard.SQLiteChartCache(os.path.join(self.tempDir, "charts.db"))
+        self.addCleanup(cache.close)
+        return cache
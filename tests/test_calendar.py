@@ -0,0 +1,80 @@
+import unittest
+
+import billboard
+from fakes import PublicationSession
+
+# Saturdays, then a switch to Tuesdays
+DATES = ["1979-07-21", "1979-07-28", "1979-08-04", "1979-08-07"]
+
+
+class PublicationCalendarTest(unittest.TestCase):
+    def setUp(self):
+        self.session = PublicationSession("hot-100", "1979-08-04-hot-100.html", DATES)
+        self.calendar = billboard.PublicationCalendar()
+
+    def fetch(self, date, **kwargs):
+        kwargs.setdefault("calendar", self.calendar)
+        return billboard.ChartData("hot-100", date=date, session=self.session, **kwargs)
+
+    def testLearnsFromFetches(self):
+        """Checks that every date of a fetched chart's week is fetched and
+        cached as the chart's own date.
+        """
+        cache = billboard.SQLiteChartCache(":memory:")
+        self.assertEqual(self.fetch("1979-07-31", cache=cache).date, "1979-08-04")
+        self.assertEqual(self.calendar.dates("hot-100"), ["1979-08-04"])
+        self.assertEqual(self.calendar.canonical("hot-100", "1979-08-02"), "1979-08-04")
+        self.assertIsNone(self.calendar.canonical("hot-100", "1979-07-30"))
+
+        chart = self.fetch("1979-08-02", cache=cache)
+        self.assertEqual(chart.date, "1979-08-04")
+        self.assertEqual(len(chart), 100)
+        self.assertEqual(len(self.session.requested), 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(self.calendar.hits, 2)
+
+    def testCanonicalRequest(self):
+        self.fetch("1979-07-31")
+        self.fetch("1979-08-03")
+        self.assertEqual(
+            self.session.requested,
+            [
+                "https://www.billboard.com/charts/hot-100/1979-07-31",
+                "https://www.billboard.com/charts/hot-100/1979-08-04",
+            ],
+        )
+
+    def testWeekdayRule(self):
+        self.calendar.add("hot-100", ["1979-06-30", "1979-08-04", "1979-08-07"])
+        canonical = self.calendar.canonical
+        # Weekly on Saturdays between two known Saturdays
+        self.assertEqual(canonical("hot-100", "1979-07-18"), "1979-07-21")
+        self.assertEqual(canonical("hot-100", "1979-07-21"), "1979-07-21")
+        self.assertEqual(canonical("hot-100", "1979-06-30"), "1979-06-30")
+        # Not across a change of weekday, before the first known chart, or
+        # after the last one
+        self.assertIsNone(canonical("hot-100", "1979-08-05"))
+        self.assertIsNone(canonical("hot-100", "1979-06-29"))
+        self.assertIsNone(canonical("hot-100", "1979-08-08"))
+        self.assertIsNone(canonical("artist-100", "1979-07-18"))
+
+        self.calendar.max_gap = 4
+        self.assertIsNone(canonical("hot-100", "1979-07-18"))
+
+    def testDefaultCalendar(self):
+        """Checks that no calendar is used unless one is set or given."""
+        self.fetch("1979-07-31", calendar=None)
+        self.fetch("1979-08-03", calendar=None)
+        self.assertEqual(
+            self.session.requested[-1],
+            "https://www.billboard.com/charts/hot-100/1979-08-03",
+        )
+
+        billboard.set_default_calendar(self.calendar)
+        self.addCleanup(billboard.set_default_calendar, None)
+        self.fetch("1979-07-31", calendar=None)
+        self.fetch("1979-08-03", calendar=None)
+        self.assertEqual(
+            self.session.requested[-1],
+            "https://www.billboard.com/charts/hot-100/1979-08-04",
+        )
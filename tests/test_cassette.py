@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+import billboard
+from fakes import FixtureAdapter, readFixture
+
+PAGES = {
+    "/charts/hot-100": "1979-08-04-hot-100.html",
+    "/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html",
+}
+
+
+class CassetteTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def session(self, **kwargs):
+        session = requests.Session()
+        adapter = billboard.CassetteAdapter(self.path, **kwargs)
+        session.mount("https://www.billboard.com", adapter)
+        return session
+
+    def record(self, *args, **kwargs):
+        upstream = FixtureAdapter(PAGES, etag='"v1"')
+        session = self.session(mode="record", upstream=upstream)
+        billboard.ChartData(*args, session=session, **kwargs)
+        return upstream
+
+    def testRecordAndReplay(self):
+        """Checks that a replayed chart matches the reference, without going
+        upstream.
+        """
+        upstream = self.record("hot-100", date="1979-08-04")
+        self.assertEqual(len(upstream.requested), 1)
+        self.assertEqual(os.listdir(self.path), ["charts%2Fhot-100%2F1979-08-04.json"])
+
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-04", session=self.session()
+        )
+        reference = json.loads(readFixture("1979-08-04-hot-100.json"))
+        actual = json.loads(chart.json())
+        for entry in reference["entries"] + actual["entries"]:
+            del entry["image"]
+        self.assertEqual(actual["entries"], reference["entries"])
+        self.assertEqual(chart.date, reference["date"])
+
+    def testAutoMode(self):
+        upstream = FixtureAdapter(PAGES)
+        session = self.session(mode="auto", upstream=upstream)
+        for _ in range(2):
+            billboard.ChartData("hot-100", date="1979-08-04", session=session)
+        self.assertEqual(len(upstream.requested), 1)
+
+    def testNotRecorded(self):
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            billboard.ChartData,
+            "hot-100",
+            date="1979-08-04",
+            session=self.session(),
+        )
+        self.assertRaises(ValueError, billboard.CassetteAdapter, self.path, "rewind")
+
+    def testNotFound(self):
+        """Checks that 404 responses are recorded and replayed."""
+        self.assertRaises(
+            billboard.BillboardNotFoundException, self.record, "does-not-exist"
+        )
+        self.assertRaises(
+            billboard.BillboardNotFoundException,
+            billboard.ChartData,
+            "does-not-exist",
+            session=self.session(),
+        )
+
+    def testConditionalReplay(self):
+        store = billboard.ValidatorStore()
+        billboard.set_default_validator_store(store)
+        self.addCleanup(
+            billboard.set_default_validator_store, billboard.ValidatorStore()
+        )
+        self.record("hot-100")
+        session = self.session()
+        for _ in range(2):
+            billboard.ChartData("hot-100", session=session)
+        self.assertEqual(store.saved, 2)
+
+    def testFaults(self):
+        self.record("hot-100", date="1979-08-04")
+        session = self.session(faults={429: 1.0}, retry_after=7)
+        response = session.get("https://www.billboard.com/charts/hot-100/1979-08-04")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "7")
+        self.assertRaises(
+            requests.exceptions.HTTPError,
+            billboard.ChartData,
+            "hot-100",
+            date="1979-08-04",
+            session=self.session(faults={503: 1.0}),
+        )
+
+        def statuses(seed):
+            session = self.session(faults={404: 0.3, 500: 0.3}, seed=seed)
+            url = "https://www.billboard.com/charts/hot-100/1979-08-04"
+            return [session.get(url).status_code for _ in range(20)]
+
+        self.assertEqual(statuses(1), statuses(1))
+        self.assertEqual(set(statuses(1)), set([200, 404, 500]))
+
+    def testLatency(self):
+        self.record("hot-100", date="1979-08-04")
+        url = "https://www.billboard.com/charts/hot-100/1979-08-04"
+        with mock.patch.object(billboard.time, "sleep") as sleep:
+            self.session(latency=0.5).get(url)
+            self.session(latency=(1, 2)).get(url)
+        self.assertEqual(sleep.call_args_list[0][0][0], 0.5)
+        self.assertTrue(1 <= sleep.call_args_list[1][0][0] <= 2)
+
+    def testConfigureSession(self):
+        """Checks that configure_session() can put every shared session on a
+        cassette.
+        """
+        self.record("hot-100", date="1979-08-04")
+        billboard.configure_session(cassette=self.path)
+        self.addCleanup(billboard.configure_session, cassette=None)
+        session = billboard._get_session_with_retries(5)
+        adapter = session.get_adapter("https://www.billboard.com/charts/hot-100")
+        self.assertIsInstance(adapter, billboard.CassetteAdapter)
+        self.assertEqual(adapter.mode, "replay")
+        self.assertIsInstance(adapter.upstream, requests.adapters.HTTPAdapter)
+        chart = billboard.ChartData("hot-100", date="1979-08-04")
+        self.assertEqual(chart[0].title, "Bad Girls")
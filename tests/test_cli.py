@@ -0,0 +1,96 @@
+import contextlib
+import io
+import json
+import unittest
+from unittest import mock
+
+import billboard
+from fakes import FakeSession, PublicationSession
+
+
+class CommandLineTest(unittest.TestCase):
+    def run_main(self, session, *argv):
+        """Runs the `billboard` command with `argv` against `session`, and
+        returns its exit status, the charts written and the error output.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(
+            billboard, "_get_session_with_retries", return_value=session
+        ), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = billboard.main(list(argv))
+        charts = [
+            billboard.ChartData.from_json(line)
+            for line in stdout.getvalue().splitlines()
+        ]
+        return status, charts, stderr.getvalue()
+
+    def testDateRange(self):
+        """Checks that every week in the range is written as one JSON line,
+        in order when --ordered is given.
+        """
+        session = PublicationSession(
+            "hot-100",
+            "1979-08-04-hot-100.html",
+            ["1979-07-28", "1979-08-04", "1979-08-11"],
+        )
+        status, charts, errors = self.run_main(
+            session,
+            "hot-100",
+            "--since",
+            "1979-07-25",
+            "--until",
+            "1979-08-10",
+            "--ordered",
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual(errors, "")
+        self.assertEqual(
+            [chart.date for chart in charts],
+            ["1979-07-28", "1979-08-04", "1979-08-11"],
+        )
+        self.assertEqual(len(charts[0]), 100)
+        self.assertEqual(charts[0][0].title, "Bad Girls")
+
+    def testDuplicateWeeks(self):
+        """Checks that a chart found from two requested dates is written
+        once.
+        """
+        session = PublicationSession(
+            "hot-100", "1979-08-04-hot-100.html", ["1979-08-18"]
+        )
+        status, charts, _ = self.run_main(
+            session, "hot-100", "--since", "1979-08-01", "--until", "1979-08-08"
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual(len(session.requested), 2)
+        self.assertEqual([chart.date for chart in charts], ["1979-08-18"])
+
+    def testYears(self):
+        session = FakeSession(
+            {"/charts/year-end/2019/hot-100-songs": "2019-hot-100-songs-year-end.html"}
+        )
+        status, charts, errors = self.run_main(
+            session, "hot-100-songs", "--years", "2018", "2019", "--ordered"
+        )
+        self.assertEqual(status, 1)
+        self.assertEqual([chart.year for chart in charts], ["2019"])
+        self.assertEqual(len(charts[0]), 10)
+        self.assertIn("hot-100-songs 2018", errors)
+
+    def testErrorsDoNotStopOthers(self):
+        session = FakeSession({"/charts/hot-100": "1979-08-04-hot-100.html"})
+        status, charts, errors = self.run_main(session, "does-not-exist", "hot-100")
+        self.assertEqual(status, 1)
+        self.assertEqual([chart.name for chart in charts], ["hot-100"])
+        self.assertIn("does-not-exist", errors)
+
+    def testBadArguments(self):
+        for argv in (
+            ["hot-100", "--years", "2017", "2018", "2019"],
+            ["hot-100", "--until", "2019-01-01"],
+            ["hot-100", "--since", "2019-13-01"],
+            ["hot-100", "--workers", "0"],
+        ):
+            with contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    billboard.main(argv)
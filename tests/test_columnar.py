@@ -0,0 +1,66 @@
+import json
+import tracemalloc
+import unittest
+
+import billboard
+from fakes import readFixture
+
+
+def parse(htmlFile, name, date=None, year=None, columnar=False):
+    chart = billboard.ChartData(
+        name, date=date, year=year, fetch=False, columnar=columnar
+    )
+    chart._parseHtml(readFixture(htmlFile))
+    return chart
+
+
+class ColumnarTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.chart = parse("1979-08-04-hot-100.html", "hot-100", date="1979-08-04")
+        cls.columnar = parse(
+            "1979-08-04-hot-100.html", "hot-100", date="1979-08-04", columnar=True
+        )
+
+    def testSlots(self):
+        """Checks that entries don't carry a per-instance __dict__."""
+        self.assertFalse(hasattr(self.chart[0], "__dict__"))
+        self.assertEqual(json.loads(self.chart[0].json())["title"], self.chart[0].title)
+
+    def testSameEntries(self):
+        """Checks that a columnar chart has the same entries as a list."""
+        self.assertIsInstance(self.columnar.entries, billboard.ChartEntryColumns)
+        self.assertEqual(len(self.columnar), len(self.chart))
+        self.assertEqual(
+            json.loads(self.columnar.json()), json.loads(self.chart.json())
+        )
+        self.assertEqual(repr(self.columnar[0]), repr(self.chart[0]))
+        self.assertEqual(self.columnar[-1].rank, 100)
+        self.assertEqual([e.rank for e in self.columnar[:3]], [1, 2, 3])
+        self.assertRaises(IndexError, self.columnar.__getitem__, 100)
+
+    def testYearEnd(self):
+        """Checks that year-end charts can be stored in columns too."""
+        chart = parse("2019-hot-100-songs-year-end.html", "hot-100-songs", year="2019")
+        columnar = parse(
+            "2019-hot-100-songs-year-end.html",
+            "hot-100-songs",
+            year="2019",
+            columnar=True,
+        )
+        self.assertIsInstance(columnar[0], billboard.YearEndChartEntry)
+        self.assertEqual(json.loads(columnar.json()), json.loads(chart.json()))
+
+    def testMemory(self):
+        """Checks that the columnar store takes less memory than a list."""
+        data = [entry._toDict() for entry in self.chart] * 10
+
+        def measure(store):
+            tracemalloc.start()
+            for entryData in data:
+                store.append(billboard.ChartEntry._fromDict(entryData))
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size
+
+        self.assertLess(measure(billboard.ChartEntryColumns()), measure([]) / 2)
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import unittest
+
+import billboard
+from fakes import FakeAsyncSession, FakeSession
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+PAGES = {
+    "/charts/hot-100": "1979-08-04-hot-100.html",
+    "/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html",
+}
+
+
+class Base(object):
+    def setUp(self):
+        self.store = billboard.ValidatorStore()
+        billboard.set_default_validator_store(self.store)
+        self.addCleanup(
+            billboard.set_default_validator_store, billboard.ValidatorStore()
+        )
+
+
+class ConditionalGetTest(Base, unittest.TestCase):
+    def testNotModified(self):
+        """Checks that an unchanged current chart is rebuilt from the stored
+        copy.
+        """
+        session = FakeSession(PAGES, etag='"v1"')
+        first = billboard.ChartData("hot-100", session=session)
+        second = billboard.ChartData("hot-100", session=session)
+        self.assertEqual(json.loads(second.json()), json.loads(first.json()))
+        self.assertEqual(self.store.saved, 1)
+        self.assertEqual(len(session.requested), 2)
+
+    def testModified(self):
+        """Checks that a changed chart is downloaded and parsed again."""
+        session = FakeSession(PAGES, etag='"v1"')
+        billboard.ChartData("hot-100", session=session)
+        session.etag = '"v2"'
+        chart = billboard.ChartData("hot-100", session=session)
+        self.assertEqual(len(chart), 100)
+        self.assertEqual(self.store.saved, 0)
+        self.assertEqual(
+            self.store.get("https://www.billboard.com/charts/hot-100").headers,
+            {"If-None-Match": '"v2"'},
+        )
+
+    def testOnlyCurrentCharts(self):
+        """Checks that dated charts, and responses without validators, are
+        not stored.
+        """
+        billboard.ChartData(
+            "hot-100", date="1979-08-04", session=FakeSession(PAGES, etag='"v1"')
+        )
+        billboard.ChartData("hot-100", session=FakeSession(PAGES))
+        self.assertIsNone(self.store.get("https://www.billboard.com/charts/hot-100"))
+        self.assertIsNone(
+            self.store.get("https://www.billboard.com/charts/hot-100/1979-08-04")
+        )
+
+    def testMaxCharts(self):
+        store = billboard.ValidatorStore(max_charts=2)
+        for url in ["a", "b", "a", "c"]:
+            store.set(url, {"Last-Modified": "x"}, b"")
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a").headers, {"If-Modified-Since": "x"})
+
+    def testDisabled(self):
+        billboard.set_default_validator_store(None)
+        session = FakeSession(PAGES, etag='"v1"')
+        for _ in range(2):
+            self.assertEqual(len(billboard.ChartData("hot-100", session=session)), 100)
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class AsyncConditionalGetTest(Base, unittest.TestCase):
+    def testNotModified(self):
+        session = FakeAsyncSession(PAGES, etag='"v1"')
+        fetch = billboard.AsyncChartData.fetch
+        first = asyncio.run(fetch("hot-100", session=session))
+        second = asyncio.run(fetch("hot-100", session=session))
+        self.assertEqual(json.loads(second.json()), json.loads(first.json()))
+        self.assertEqual(self.store.saved, 1)
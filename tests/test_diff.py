@@ -0,0 +1,94 @@
+import unittest
+
+import billboard
+from fakes import readFixture
+
+
+def makeChart(date, rows):
+    """Returns a chart with one entry per (title, artist, lastPos, weeks)."""
+    chart = billboard.ChartData("hot-100", date=date, fetch=False)
+    for rank, (title, artist, lastPos, weeks) in enumerate(rows, 1):
+        entry = billboard.ChartEntry(
+            title, artist, None, None, lastPos, weeks, rank, weeks == 1
+        )
+        chart.entries.append(entry)
+    return chart
+
+
+OLD = makeChart(
+    "1979-08-04",
+    [
+        ("Bad Girls", "Donna Summer", 1, 10),
+        ("Good Times", "Chic", 3, 9),
+        ("Ring My Bell", "Anita Ward", 2, 12),
+        ("My Sharona", "The Knack", 0, 1),
+    ],
+)
+NEW = makeChart(
+    "1979-08-11",
+    [
+        ("Good Times", "CHIC", 2, 10),
+        ("My Sharona", "The Knack", 4, 2),
+        ("Bad Girls", "Donna Summer", 5, 11),
+        ("Gold", "John Stewart", 0, 1),
+        ("Hot Stuff", "Donna Summer", 0, 14),
+        ("Ring My Bell (Remix)", "Anita Ward", 3, 13),
+    ],
+)
+
+
+def titles(movements):
+    return [movement.title for movement in movements]
+
+
+class DiffTest(unittest.TestCase):
+    def testDiff(self):
+        result = billboard.diff(OLD, NEW)
+        self.assertEqual((result.oldDate, result.newDate), ("1979-08-04", "1979-08-11"))
+        self.assertEqual(titles(result.climbers), ["Good Times", "My Sharona"])
+        self.assertEqual(titles(result.fallers), ["Bad Girls", "Ring My Bell (Remix)"])
+        self.assertEqual(result.unchanged, [])
+        self.assertEqual(titles(result.debuts), ["Gold"])
+        self.assertEqual(titles(result.reentries), ["Hot Stuff"])
+        self.assertEqual(result.dropouts, [])
+        self.assertEqual(
+            result.climbers[1],
+            billboard.ChartMovement("My Sharona", "The Knack", 2, 4, 2),
+        )
+        self.assertEqual(result.fallers[0].change, -2)
+        self.assertEqual(result.debuts[0].lastRank, None)
+
+    def testMismatches(self):
+        """Checks that lastPos is checked against the old chart, and used to
+        match entries whose title changed.
+        """
+        result = billboard.diff(OLD, NEW)
+        self.assertEqual(titles(result.mismatches), ["Bad Girls"])
+        self.assertEqual(result.mismatches[0].lastRank, 1)
+
+        # Charts more than a week apart can't be cross-checked
+        later = billboard.ChartData.from_bytes(NEW.to_bytes())
+        later.date = "1979-08-18"
+        result = billboard.diff(OLD, later)
+        self.assertEqual(result.mismatches, [])
+        self.assertEqual(titles(result.debuts), ["Gold"])
+        self.assertEqual(
+            titles(result.reentries), ["Hot Stuff", "Ring My Bell (Remix)"]
+        )
+        self.assertEqual(titles(result.dropouts), ["Ring My Bell"])
+
+    def testSameChart(self):
+        chart = billboard.ChartData("hot-100", date="1979-08-04", fetch=False)
+        chart._parseHtml(readFixture("1979-08-04-hot-100.html"))
+        columnar = billboard.ChartData.from_bytes(chart.to_bytes(), columnar=True)
+        result = billboard.diff(chart, columnar)
+        self.assertEqual(len(result.unchanged), 100)
+        self.assertEqual(result.debuts + result.dropouts, [])
+
+    def testSeries(self):
+        newest = makeChart("1979-08-18", [("Gold", "John Stewart", 4, 2)])
+        results = list(billboard.diff_series([OLD, NEW, newest]))
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], billboard.diff(OLD, NEW))
+        self.assertEqual(titles(results[1].climbers), ["Gold"])
+        self.assertEqual(len(results[1].dropouts), 5)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import billboard
+from fakes import readFixture
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def parse(htmlFile, name, date=None, year=None, columnar=False):
+    chart = billboard.ChartData(
+        name, date=date, year=year, fetch=False, columnar=columnar
+    )
+    chart._parseHtml(readFixture(htmlFile))
+    return chart
+
+
+class Base:
+    @classmethod
+    def setUpClass(cls):
+        cls.charts = [
+            parse("1979-08-04-hot-100.html", "hot-100", date="1979-08-04"),
+            parse(
+                "1979-08-04-hot-100.html", "hot-100", date="1979-08-04", columnar=True
+            ),
+            parse("2019-hot-100-songs-year-end.html", "hot-100-songs", year="2019"),
+        ]
+        cls.rows = sum(len(chart) for chart in cls.charts)
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestArrow(Base, unittest.TestCase):
+    def testTable(self):
+        table = billboard.to_arrow(self.charts)
+        self.assertEqual(table.num_rows, self.rows)
+        rows = table.to_pylist()
+        self.assertEqual(rows[0]["title"], "Bad Girls")
+        self.assertEqual(rows[0]["date"], "1979-08-04")
+        self.assertEqual(rows[0]["weeks"], 11)
+        self.assertEqual(rows[100:200], rows[:100])
+        self.assertEqual(rows[-1]["year"], "2019")
+        self.assertIsNone(rows[-1]["date"])
+        self.assertIsNone(rows[-1]["peakPos"])
+
+    def testDictionaryEncoding(self):
+        """Checks that repeated strings are only stored once."""
+        table = billboard.to_arrow(self.charts)
+        self.assertEqual(len(table.column("title").chunk(0).dictionary), 110)
+        self.assertEqual(len(table.column("name").chunk(0).dictionary), 2)
+
+    def testParquet(self):
+        tempDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempDir)
+        path = os.path.join(tempDir, "charts.parquet")
+        billboard.to_parquet(self.charts, path)
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.num_rows, self.rows)
+        self.assertEqual(table.column("artist")[0].as_py(), "Donna Summer")
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestNumpy(Base, unittest.TestCase):
+    def testRecordArray(self):
+        records = billboard.to_numpy(self.charts)
+        self.assertEqual(len(records), self.rows)
+        self.assertEqual(records[0].title, "Bad Girls")
+        self.assertEqual(records.rank[:3].tolist(), [1, 2, 3])
+        self.assertEqual(records.peakPos[-1], -1)
+        self.assertIsNone(records.date[-1])
+        self.assertIs(records.artist[0], records.artist[100])
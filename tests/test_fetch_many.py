@@ -0,0 +1,70 @@
+import time
+import unittest
+from unittest import mock
+
+import billboard
+from fakes import FakeSession
+
+
+class FetchManyTest(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession(
+            {"/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html"}
+        )
+
+    def testOrderedResults(self):
+        """Checks that results follow the input order and that a failing
+        chart is reported without aborting the batch.
+        """
+        queries = [
+            ("hot-100", "1979-08-04"),
+            ("does-not-exist", "1979-08-04"),
+            ("hot-100", "1979-08-04"),
+        ]
+        results = list(
+            billboard.fetch_many(queries, max_workers=3, session=self.session)
+        )
+        self.assertEqual([r.name for r in results], [q[0] for q in queries])
+        self.assertEqual(len(results[0].chart), 100)
+        self.assertIsNone(results[0].error)
+        self.assertIsNone(results[1].chart)
+        self.assertIsInstance(results[1].error, billboard.BillboardNotFoundException)
+        self.assertEqual(len(results[2].chart), 100)
+
+    def testClosesOwnSession(self):
+        """Checks that the session made for more workers than the shared
+        pool allows is closed afterwards.
+        """
+        with mock.patch.dict(billboard._sessionOptions, pool_maxsize=10):
+            with mock.patch.object(
+                billboard, "make_session", return_value=self.session
+            ):
+                results = list(
+                    billboard.fetch_many([("hot-100", "1979-08-04")], max_workers=32)
+                )
+        self.assertIsNone(results[0].error)
+        self.assertTrue(self.session.closed)
+
+        self.session.closed = False
+        list(billboard.fetch_many([], max_workers=2, session=self.session))
+        self.assertFalse(self.session.closed)
+
+    def testQueryParsing(self):
+        """Checks that years, dates and bare names are told apart."""
+        self.assertEqual(billboard._parseQuery("hot-100"), ("hot-100", None, None))
+        self.assertEqual(
+            billboard._parseQuery(("hot-100-songs", 2019)),
+            ("hot-100-songs", None, "2019"),
+        )
+        self.assertEqual(
+            billboard._parseQuery(("hot-100", "2019-01-05")),
+            ("hot-100", "2019-01-05", None),
+        )
+
+    def testRateLimit(self):
+        """Checks that the rate limiter spaces out requests."""
+        limiter = billboard.RateLimiter(20)
+        start = time.time()
+        for _ in range(5):
+            limiter.wait()
+        self.assertGreaterEqual(time.time() - start, 0.19)
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+BENCHMARK = os.path.join(ROOT_DIR, "benchmarks", "bench_import.py")
+
+
+def importedBy(statements):
+    """Returns the modules imported by running `statements` in a fresh
+    interpreter.
+    """
+    code = (
+        "import json, sys\n"
+        "sys.path.insert(0, %r)\n"
+        "%s\n"
+        "print(json.dumps(sorted(sys.modules)))\n" % (ROOT_DIR, statements)
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return set(json.loads(output.decode("utf-8")))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Checks that `import billboard` leaves the heavy dependencies until
+    they're needed.
+    """
+
+    def testImportIsLight(self):
+        """Checks that bench_import.py finds none of its HEAVY_MODULES
+        imported by `import billboard`.
+        """
+        process = subprocess.Popen(
+            [sys.executable, BENCHMARK, "--repeat", "1"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        _, errors = process.communicate()
+        self.assertEqual(process.returncode, 0, errors.decode("utf-8"))
+
+    def testLoadingSavedChartIsLight(self):
+        modules = importedBy(
+            "import billboard\n"
+            "chart = billboard.ChartData('hot-100', fetch=False)\n"
+            "billboard.ChartData.from_bytes(chart.to_bytes())\n"
+            "billboard.ChartData.from_json(chart.json())"
+        )
+        self.assertNotIn("requests", modules)
+        self.assertNotIn("bs4", modules)
+
+    def testParsingImportsParser(self):
+        modules = importedBy(
+            "import billboard\n"
+            "chart = billboard.ChartData('hot-100', fetch=False)\n"
+            "chart._parseHtml('<html><table></table></html>')"
+        )
+        self.assertIn("bs4", modules)
+        self.assertNotIn("requests", modules)
+
+    def testSessionImportsRequests(self):
+        modules = importedBy("import billboard\nbillboard.make_session()")
+        self.assertIn("requests", modules)
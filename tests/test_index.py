@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import billboard
+from fakes import readFixture
+
+
+def parse(htmlFile, name, date=None, year=None):
+    chart = billboard.ChartData(name, date=date, year=year, fetch=False)
+    chart._parseHtml(readFixture(htmlFile))
+    return chart
+
+
+class ChartIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.week1 = parse("1979-08-04-hot-100.html", "hot-100", date="1979-08-04")
+        cls.week2 = billboard.ChartData.from_bytes(cls.week1.to_bytes())
+        cls.week2.date = "1979-08-11"
+        cls.yearEnd = parse(
+            "2019-hot-100-songs-year-end.html", "hot-100-songs", year="2019"
+        )
+
+    def setUp(self):
+        self.index = billboard.ChartIndex([self.week1, self.yearEnd])
+
+    def testArtist(self):
+        postings = self.index.search(artist="donna summer")
+        self.assertEqual(
+            [(p.date, p.rank, p.title) for p in postings],
+            [("1979-08-04", 1, "Bad Girls"), ("1979-08-04", 9, "Hot Stuff")],
+        )
+        self.assertEqual(postings[0].name, "hot-100")
+        self.assertEqual(postings[0].artist, "Donna Summer")
+
+    def testNormalization(self):
+        """Checks that case, punctuation and spacing are ignored, and that
+        featured artists are found on their own.
+        """
+        self.assertEqual(len(self.index.search(title="MAKIN IT")), 1)
+        self.assertEqual(len(self.index.search(artist="  dr hook ")), 1)
+        posting = self.index.search(artist="Billy Ray Cyrus")[0]
+        self.assertEqual(posting.title, "Old Town Road")
+        self.assertEqual(posting.year, "2019")
+        self.assertIsNone(posting.date)
+        self.assertEqual(len(self.index.search(artist="post malone")), 2)
+
+    def testPrefix(self):
+        self.assertEqual(self.index.search(artist="donna sum"), [])
+        self.assertEqual(len(self.index.search(artist="donna sum", prefix=True)), 2)
+        titles = [p.title for p in self.index.search(title="s", prefix=True)]
+        self.assertIn("Sucker", titles)
+        self.assertIn("Sicko Mode", titles)
+
+    def testArtistAndTitle(self):
+        postings = self.index.search(artist="Donna Summer", title="Hot Stuff")
+        self.assertEqual([p.rank for p in postings], [9])
+        self.assertRaises(ValueError, self.index.search)
+
+    def testAdd(self):
+        """Checks that charts can be added after prefix searches, and that a
+        chart is only indexed once.
+        """
+        self.index.search(artist="d", prefix=True)
+        self.assertTrue(self.index.add(self.week2))
+        self.assertFalse(self.index.add(self.week2))
+        self.assertEqual(len(self.index), 3)
+        postings = self.index.search(artist="donna", prefix=True)
+        self.assertEqual(
+            [p.date for p in postings],
+            ["1979-08-04", "1979-08-04", "1979-08-11", "1979-08-11"],
+        )
+
+    def testSavedIndex(self):
+        """Checks that an index kept in a file is loaded back without
+        normalizing anything, and is added to incrementally.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "hot-100.index")
+        billboard.ChartIndex([self.week1, self.yearEnd], path=path)
+
+        with mock.patch.object(billboard, "_normalize", side_effect=AssertionError):
+            index = billboard.ChartIndex(path=path)
+        self.assertEqual(len(index), 2)
+        self.assertTrue(index.contains("hot-100", "1979-08-04"))
+        self.assertFalse(index.contains("hot-100", "1979-08-11"))
+        self.assertEqual(
+            index.search(artist="post malone"), self.index.search(artist="post malone")
+        )
+
+        # A line cut short by a crash is skipped, and not appended to
+        with open(path, "ab") as f:
+            f.write(b'{"date": "1979-')
+        index = billboard.ChartIndex(path=path)
+        self.assertTrue(index.add(self.week2))
+        index = billboard.ChartIndex(path=path)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(len(index.search(artist="donna summer")), 4)
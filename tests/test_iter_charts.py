@@ -0,0 +1,36 @@
+import unittest
+
+import billboard
+from fakes import PublicationSession
+
+# Saturdays, with a switch to Tuesdays (as in a change of publication day)
+DATES = ["1979-07-14", "1979-07-21", "1979-07-28", "1979-08-04", "1979-08-07"]
+
+
+class IterChartsTest(unittest.TestCase):
+    def setUp(self):
+        self.session = PublicationSession("hot-100", "1979-08-04-hot-100.html", DATES)
+
+    def dates(self, *args, **kwargs):
+        charts = billboard.iter_charts("hot-100", *args, session=self.session, **kwargs)
+        return [chart.date for chart in charts]
+
+    def testForward(self):
+        """Checks that dates are rounded up and the weekday is followed."""
+        self.assertEqual(self.dates("1979-07-10", "1979-08-10"), DATES)
+
+    def testBackward(self):
+        """Checks that charts are yielded newest first when end < start."""
+        self.assertEqual(
+            self.dates("1979-08-10", "1979-07-20", prefetch=2), DATES[:0:-1]
+        )
+
+    def testStep(self):
+        """Checks that step=N yields every Nth week."""
+        self.assertEqual(
+            self.dates("1979-07-14", "1979-08-04", step=2, prefetch=0),
+            ["1979-07-14", "1979-07-28"],
+        )
+        self.assertRaises(
+            ValueError, list, billboard.iter_charts("hot-100", "1979-07-14", step=0)
+        )
@@ -0,0 +1,132 @@
+import threading
+import time
+import unittest
+
+import billboard
+from fakes import FakeSession, PublicationSession
+
+PAGES = {
+    "/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html",
+    "/charts/year-end/2019/hot-100-songs": "2019-hot-100-songs-year-end.html",
+}
+
+
+class SlowSession(FakeSession):
+    """A FakeSession whose responses take a while, so that concurrent reads
+    of a lazy chart overlap.
+    """
+
+    def get(self, url, **kwargs):
+        time.sleep(0.05)
+        return super(SlowSession, self).get(url, **kwargs)
+
+
+class LazyChartTest(unittest.TestCase):
+    def testFetchesOnFirstRead(self):
+        session = FakeSession(PAGES)
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-04", session=session, lazy=True
+        )
+        self.assertEqual(session.requested, [])
+        self.assertEqual(
+            repr(chart), "billboard.ChartData('hot-100', date='1979-08-04')"
+        )
+        self.assertEqual(session.requested, [])
+
+        self.assertEqual(len(chart), 100)
+        self.assertEqual(chart[0].title, "Bad Girls")
+        self.assertTrue(chart.title.startswith("Billboard Hot 100"))
+        self.assertEqual(len(session.requested), 1)
+        self.assertNotIn("_lazyLock", chart.__dict__)
+
+    def testEachAttributeTriggersFetch(self):
+        for read in (
+            lambda chart: chart.entries,
+            lambda chart: chart[0],
+            lambda chart: len(chart),
+            lambda chart: chart.title,
+            lambda chart: chart.date,
+            lambda chart: chart.to_bytes(),
+            lambda chart: chart.fetchEntries(),
+        ):
+            session = FakeSession(PAGES)
+            chart = billboard.ChartData(
+                "hot-100", date="1979-08-04", session=session, lazy=True
+            )
+            read(chart)
+            self.assertEqual(len(session.requested), 1)
+            self.assertEqual(len(chart), 100)
+            self.assertEqual(len(session.requested), 1)
+
+        for read in (
+            lambda chart: chart.previousYear,
+            lambda chart: chart.nextYear,
+        ):
+            session = FakeSession(PAGES)
+            chart = billboard.ChartData(
+                "hot-100-songs", year="2019", session=session, lazy=True
+            )
+            read(chart)
+            self.assertEqual(len(session.requested), 1)
+            self.assertEqual((chart.previousYear, chart.nextYear), ("2018", "2020"))
+            self.assertEqual(len(session.requested), 1)
+
+    def testDateIsPublicationDate(self):
+        """Checks that `date` gives the date of the chart that was found,
+        not the date that was requested.
+        """
+        session = PublicationSession(
+            "hot-100", "1979-08-04-hot-100.html", ["1979-08-04"]
+        )
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-01", session=session, lazy=True
+        )
+        self.assertEqual(chart.date, "1979-08-04")
+
+    def testSameAsEager(self):
+        eager = billboard.ChartData(
+            "hot-100", date="1979-08-04", session=FakeSession(PAGES), columnar=True
+        )
+        lazy = billboard.ChartData(
+            "hot-100",
+            date="1979-08-04",
+            session=FakeSession(PAGES),
+            columnar=True,
+            lazy=True,
+        )
+        self.assertEqual(lazy.to_bytes(), eager.to_bytes())
+        self.assertEqual(lazy.json(), eager.json())
+        self.assertIsInstance(lazy.entries, billboard.ChartEntryColumns)
+
+    def testConcurrentReadsFetchOnce(self):
+        session = SlowSession(PAGES)
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-04", session=session, lazy=True
+        )
+        lengths = []
+        threads = [
+            threading.Thread(target=lambda: lengths.append(len(chart)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(lengths, [100] * 8)
+        self.assertEqual(len(session.requested), 1)
+
+    def testFailedFetchIsRetried(self):
+        session = FakeSession({})
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-04", session=session, lazy=True
+        )
+        with self.assertRaises(billboard.BillboardNotFoundException):
+            len(chart)
+        session.pages = PAGES
+        self.assertEqual(len(chart), 100)
+        self.assertEqual(len(session.requested), 2)
+
+    def testMissingAttribute(self):
+        chart = billboard.ChartData("hot-100", lazy=True)
+        with self.assertRaises(AttributeError):
+            chart.doesNotExist
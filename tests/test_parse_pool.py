@@ -0,0 +1,51 @@
+import unittest
+
+import billboard
+from fakes import FakeSession
+
+PAGES = {
+    "/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html",
+    "/charts/artist-100/2014-08-02": "2014-08-02-artist-100.html",
+    "/charts/year-end/2019/hot-100-songs": "2019-hot-100-songs-year-end.html",
+}
+
+QUERIES = [
+    ("hot-100", "1979-08-04"),
+    ("artist-100", "2014-08-02"),
+    ("hot-100-songs", 2019),
+    ("does-not-exist", "1979-08-04"),
+]
+
+
+class ParsePoolTest(unittest.TestCase):
+    def fetch(self, **kwargs):
+        return list(
+            billboard.fetch_many(
+                QUERIES, max_workers=4, session=FakeSession(PAGES), **kwargs
+            )
+        )
+
+    def testSameCharts(self):
+        """Checks that charts parsed in worker processes are identical to
+        charts parsed on the download threads.
+        """
+        expected = self.fetch()
+        results = self.fetch(parse_processes=2)
+        self.assertEqual([r.name for r in results], [q[0] for q in QUERIES])
+        for result, expectedResult in zip(results[:3], expected):
+            self.assertIsNone(result.error)
+            self.assertEqual(result.chart.to_bytes(), expectedResult.chart.to_bytes())
+            self.assertIsNone(result.chart._parsePool)
+            self.assertNotIn("_parsePool", result.chart._toDict())
+        self.assertIsInstance(results[3].error, billboard.BillboardNotFoundException)
+
+    def testColumnarAndStats(self):
+        results = self.fetch(parse_processes=1, columnar=True, collect_stats=True)
+        chart = results[0].chart
+        self.assertIsInstance(chart.entries, billboard.ChartEntryColumns)
+        self.assertEqual(chart[0].title, "Bad Girls")
+        self.assertEqual(chart.date, "1979-08-04")
+        self.assertEqual(chart.stats.source, "network")
+        self.assertGreater(chart.stats.treeTime, 0)
+        self.assertGreater(chart.stats.entriesTime, 0)
+        self.assertEqual(chart.stats.entryCount, 100)
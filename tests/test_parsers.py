@@ -0,0 +1,124 @@
+import json
+import unittest
+
+import billboard
+from bs4 import BeautifulSoup
+from fakes import readFixture
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+try:
+    import selectolax
+except ImportError:
+    selectolax = None
+
+# (HTML fixture, reference JSON or None, chart name, date, year)
+PAGES = [
+    (
+        "1979-08-04-hot-100.html",
+        "1979-08-04-hot-100.json",
+        "hot-100",
+        "1979-08-04",
+        None,
+    ),
+    (
+        "2006-08-05-traditional-jazz-albums.html",
+        "2006-08-05-traditional-jazz-albums.json",
+        "traditional-jazz-albums",
+        "2006-08-05",
+        None,
+    ),
+    (
+        "2014-08-02-artist-100.html",
+        "2014-08-02-artist-100.json",
+        "artist-100",
+        "2014-08-02",
+        None,
+    ),
+    ("2019-hot-100-songs-year-end.html", None, "hot-100-songs", None, "2019"),
+]
+
+
+def parse(parser, htmlFile, name, date, year, partialParse=True):
+    chart = billboard.ChartData(
+        name,
+        date=date,
+        year=year,
+        fetch=False,
+        parser=parser,
+        partial_parse=partialParse,
+    )
+    chart._parseHtml(readFixture(htmlFile))
+    return json.loads(chart.json())
+
+
+class Base:
+    def testCorrectnessVersusReference(self):
+        """Checks that every page parses to the same chart as with the
+        default parser, and to the reference chart where there is one.
+        """
+        for htmlFile, referenceFile, name, date, year in PAGES:
+            chart = parse(self.parser, htmlFile, name, date, year)
+            expected = parse("html.parser", htmlFile, name, date, year)
+            self.assertEqual(chart, expected)
+            if referenceFile:
+                reference = json.loads(readFixture(referenceFile))
+                self.assertEqual(chart["title"], reference["title"])
+                self.assertEqual(chart["date"], reference["date"])
+                self.assertEqual(chart["entries"], reference["entries"])
+
+    def testNestedImage(self):
+        """Checks that every parser finds a row's image with the same rule,
+        including in a nested list.
+        """
+        html = readFixture(PAGES[0][0]).replace(
+            '<span class="c-label u-hidden">Award</span>',
+            '<span class="c-label u-hidden">Award</span><img data-lazy-src="a.jpg">',
+            1,
+        )
+        chart = billboard.ChartData("hot-100", fetch=False, parser=self.parser)
+        chart._parseHtml(html)
+        self.assertEqual(chart[0].image, "a.jpg")
+        self.assertIsNone(chart[1].image)
+
+
+class TestHtmlParser(Base, unittest.TestCase):
+    parser = "html.parser"
+
+    def testPartialParse(self):
+        """Checks that only parsing the chart region of a page gives the
+        same chart as parsing the whole page, from a much smaller tree.
+        """
+        for htmlFile, _, name, date, year in PAGES:
+            self.assertEqual(
+                parse(self.parser, htmlFile, name, date, year, partialParse=True),
+                parse(self.parser, htmlFile, name, date, year, partialParse=False),
+            )
+
+        html = readFixture(PAGES[0][0])
+        partial = BeautifulSoup(
+            html, "html.parser", parse_only=billboard._chartRegionStrainer()
+        )
+        full = BeautifulSoup(html, "html.parser")
+        self.assertIsNone(partial.find("script"))
+        self.assertIsNone(partial.find("nav"))
+        self.assertLess(len(list(partial.descendants)), len(list(full.descendants)))
+
+    def testInvalidParser(self):
+        self.assertRaises(
+            ValueError, billboard.ChartData, "hot-100", fetch=False, parser="regex"
+        )
+        self.assertRaises(ValueError, billboard.set_default_parser, "regex")
+
+
+@unittest.skipIf(lxml is None, "lxml is not installed")
+class TestLxmlParser(Base, unittest.TestCase):
+    parser = "lxml"
+
+
+@unittest.skipIf(selectolax is None, "selectolax is not installed")
+class TestSelectolaxParser(Base, unittest.TestCase):
+    parser = "selectolax"
@@ -0,0 +1,196 @@
+import asyncio
+import email.utils
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+import billboard
+from fakes import FakeAsyncResponse, FakeAsyncSession, FakeResponse, FixtureAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+PAGES = {"/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html"}
+
+
+def scripted(statuses, headers=None):
+    """Returns a send function that answers with each of `statuses` in turn."""
+    statuses = list(statuses)
+
+    def send(request, **kwargs):
+        return FakeResponse("", status_code=statuses.pop(0), headers=headers)
+
+    return send
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def testBackoff(self):
+        policy = billboard.RetryPolicy(backoff_factor=0.5, backoff_max=3, jitter=0)
+        self.assertEqual([policy.delay(i) for i in range(4)], [0.5, 1, 2, 3])
+        policy = billboard.RetryPolicy(backoff_factor=0.5, jitter=0.25)
+        delays = [policy.delay(1) for _ in range(20)]
+        self.assertTrue(all(1 <= delay <= 1.25 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def testRetryAfter(self):
+        policy = billboard.RetryPolicy(jitter=0)
+        self.assertEqual(policy.delay(0, "120"), 120)
+        future = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(policy.delay(0, future), 30, delta=2)
+        self.assertEqual(policy.delay(0, "soon"), 0.5)
+        policy = billboard.RetryPolicy(jitter=0, respect_retry_after=False)
+        self.assertEqual(policy.delay(0, "120"), 0.5)
+
+    def testSendWithPolicy(self):
+        """Checks that listed error responses are retried after a backoff,
+        up to the max number of retries.
+        """
+        policy = billboard.RetryPolicy(jitter=0)
+        with mock.patch.object(billboard.time, "sleep") as sleep:
+            response = billboard._sendWithPolicy(
+                scripted([503, 500, 200]), None, policy, 5
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response._statusRetries, 2)
+            self.assertEqual([c[0][0] for c in sleep.call_args_list], [0.5, 1])
+
+            response = billboard._sendWithPolicy(scripted([500, 500]), None, policy, 1)
+            self.assertEqual(response.status_code, 500)
+            response = billboard._sendWithPolicy(scripted([404]), None, policy, 5)
+            self.assertEqual(response._statusRetries, 0)
+
+    def testSessions(self):
+        policy = billboard.RetryPolicy(backoff_factor=2)
+        billboard.configure_session(retry_policy=policy)
+        self.addCleanup(billboard.configure_session, retry_policy=None)
+        session = billboard._get_session_with_retries(max_retries=3)
+        adapter = session.get_adapter("https://www.billboard.com/charts/hot-100")
+        self.assertIs(adapter.retry_policy, policy)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(adapter.max_retries.backoff_factor, 2)
+
+    def testChartData(self):
+        """Checks that ChartData rides out simulated server errors."""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        session = requests.Session()
+        adapter = billboard.CassetteAdapter(
+            path,
+            mode="auto",
+            upstream=FixtureAdapter(PAGES),
+            faults={503: 0.5},
+            seed=3,
+            retry_policy=billboard.RetryPolicy(backoff_factor=0, jitter=0),
+            max_retries=10,
+        )
+        session.mount("https://www.billboard.com", adapter)
+        chart = billboard.ChartData(
+            "hot-100", date="1979-08-04", session=session, collect_stats=True
+        )
+        self.assertEqual(len(chart), 100)
+        self.assertGreater(chart.stats.retries, 0)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def testTokenBucket(self):
+        limiter = billboard.RateLimiter(20, burst=3)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.wait()
+        self.assertLess(time.monotonic() - start, 0.04)
+        for _ in range(3):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.14)
+
+    def testInvalidArguments(self):
+        self.assertRaises(ValueError, billboard.RateLimiter, 0)
+        self.assertRaises(ValueError, billboard.RateLimiter, -1)
+        self.assertRaises(ValueError, billboard.RateLimiter, 1, burst=0)
+
+    def testPause(self):
+        """Checks that a pause holds back requests and lowers the rate until
+        requests succeed again.
+        """
+        limiter = billboard.RateLimiter(100)
+        limiter.pause(0.1)
+        self.assertEqual(limiter.rate, 50)
+        start = time.monotonic()
+        limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        for _ in range(20):
+            limiter.recordSuccess()
+        self.assertEqual(limiter.rate, 100)
+
+        limiter = billboard.RateLimiter(100, adaptive=False)
+        limiter.pause(0)
+        self.assertEqual(limiter.rate, 100)
+
+    def testSharedLimiter(self):
+        """Checks that throttling responses pause the process-wide limiter
+        instead of sleeping in one thread.
+        """
+        billboard.set_rate_limit(1000)
+        self.addCleanup(billboard.set_rate_limit, None)
+        policy = billboard.RetryPolicy(jitter=0)
+        send = scripted([429, 200], headers={"Retry-After": "0.05"})
+        with mock.patch.object(billboard._rateLimiter, "pause") as pause:
+            response = billboard._sendWithPolicy(send, None, policy, 5)
+        self.assertEqual(response.status_code, 200)
+        pause.assert_called_once_with(0.05)
+
+    def testAsync(self):
+        limiter = billboard.RateLimiter(20)
+
+        async def waitTwice():
+            await limiter.waitAsync()
+            await limiter.waitAsync()
+
+        start = time.monotonic()
+        asyncio.run(waitTwice())
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+
+class FlakyAsyncSession(FakeAsyncSession):
+    """Answers the first `failures` requests with 503 Service Unavailable."""
+
+    def __init__(self, pages, failures):
+        super(FlakyAsyncSession, self).__init__(pages)
+        self.failures = failures
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            self.requested.append(url)
+            return FakeAsyncResponse(FakeResponse("", 503))
+        return super(FlakyAsyncSession, self).get(url, headers=headers)
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class AsyncRetryTest(unittest.TestCase):
+    def testRetries(self):
+        billboard.configure_session(
+            retry_policy=billboard.RetryPolicy(backoff_factor=0, jitter=0)
+        )
+        self.addCleanup(billboard.configure_session, retry_policy=None)
+        session = FlakyAsyncSession(PAGES, failures=2)
+        chart = asyncio.run(
+            billboard.AsyncChartData.fetch(
+                "hot-100", date="1979-08-04", session=session, collect_stats=True
+            )
+        )
+        self.assertEqual(len(chart), 100)
+        self.assertEqual(chart.stats.retries, 2)
+        self.assertEqual(len(session.requested), 3)
+
+        session = FlakyAsyncSession(PAGES, failures=2)
+        coroutine = billboard.AsyncChartData.fetch(
+            "hot-100", date="1979-08-04", session=session, max_retries=1
+        )
+        # (The fake session raises the requests error)
+        self.assertRaises(requests.exceptions.HTTPError, asyncio.run, coroutine)
@@ -0,0 +1,53 @@
+import json
+import unittest
+
+import billboard
+from fakes import readFixture
+
+PAGES = [
+    ("1979-08-04-hot-100.html", "hot-100", "1979-08-04", None),
+    ("2014-08-02-artist-100.html", "artist-100", "2014-08-02", None),
+    ("2019-hot-100-songs-year-end.html", "hot-100-songs", None, "2019"),
+]
+
+
+class SerializationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.charts = []
+        for htmlFile, name, date, year in PAGES:
+            chart = billboard.ChartData(name, date=date, year=year, fetch=False)
+            chart._parseHtml(readFixture(htmlFile))
+            cls.charts.append(chart)
+
+    def testJsonRoundTrip(self):
+        for chart in self.charts:
+            loaded = billboard.ChartData.from_json(chart.json())
+            self.assertEqual(loaded.json(), chart.json())
+            self.assertEqual(type(loaded[0]), type(chart[0]))
+
+    def testBytesRoundTrip(self):
+        for chart in self.charts:
+            payload = chart.to_bytes()
+            self.assertLess(len(payload), len(chart.json()) / 2)
+            loaded = billboard.ChartData.from_bytes(payload)
+            self.assertEqual(loaded.json(), chart.json())
+            self.assertEqual(type(loaded[0]), type(chart[0]))
+
+            columnar = billboard.ChartData.from_bytes(payload, columnar=True)
+            self.assertIsInstance(columnar.entries, billboard.ChartEntryColumns)
+            self.assertEqual(columnar.json(), chart.json())
+
+    def testReferenceJson(self):
+        """Checks that JSON written by older versions can still be loaded."""
+        chart = billboard.ChartData.from_json(readFixture("1979-08-04-hot-100.json"))
+        self.assertEqual(chart.date, "1979-08-04")
+        self.assertEqual(chart[0].title, "Bad Girls")
+        self.assertEqual(chart._timeout, 25)
+
+    def testInvalidBytes(self):
+        payload = bytearray(self.charts[0].to_bytes())
+        self.assertRaises(ValueError, billboard.ChartData.from_bytes, b"BB")
+        self.assertRaises(ValueError, billboard.ChartData.from_bytes, b"X" + payload)
+        payload[4] = billboard._CHART_FORMAT_VERSION + 1
+        self.assertRaises(ValueError, billboard.ChartData.from_bytes, bytes(payload))
@@ -0,0 +1,36 @@
+import unittest
+
+import billboard
+from fakes import FakeSession
+
+
+class SessionTest(unittest.TestCase):
+    def tearDown(self):
+        billboard.configure_session()
+
+    def testSharedSession(self):
+        """Checks that fetches with the same settings share one session."""
+        first = billboard._get_session_with_retries(max_retries=5)
+        second = billboard._get_session_with_retries(max_retries=5)
+        self.assertIs(first, second)
+        self.assertIsNot(first, billboard._get_session_with_retries(max_retries=2))
+
+    def testConfigureSession(self):
+        """Checks that configure_session() replaces the shared sessions."""
+        first = billboard._get_session_with_retries(max_retries=5)
+        billboard.configure_session(pool_maxsize=32)
+        second = billboard._get_session_with_retries(max_retries=5)
+        self.assertIsNot(first, second)
+        adapter = second.get_adapter("https://www.billboard.com/charts/hot-100")
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertRaises(TypeError, billboard.configure_session, pool_size=1)
+
+    def testInjectedSession(self):
+        """Checks that a session passed to ChartData is used for fetching."""
+        session = FakeSession({"/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html"})
+        chart = billboard.ChartData("hot-100", date="1979-08-04", session=session)
+        self.assertEqual(
+            session.requested, ["https://www.billboard.com/charts/hot-100/1979-08-04"]
+        )
+        self.assertEqual(len(chart), 100)
+        self.assertNotIn("_session", chart.json())
@@ -0,0 +1,115 @@
+import asyncio
+import datetime
+import json
+import shutil
+import tempfile
+import types
+import unittest
+
+import billboard
+from fakes import FakeAsyncSession, FakeResponse, FakeSession, readFixture
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+PAGES = {
+    "/charts/hot-100": "1979-08-04-hot-100.html",
+    "/charts/hot-100/1979-08-04": "1979-08-04-hot-100.html",
+}
+PAGE_BYTES = len(readFixture("1979-08-04-hot-100.html").encode("utf-8"))
+
+
+class FetchStatsTest(unittest.TestCase):
+    def fetch(self, *args, **kwargs):
+        kwargs.setdefault("session", FakeSession(PAGES))
+        return billboard.ChartData("hot-100", *args, **kwargs)
+
+    def testDisabled(self):
+        chart = self.fetch(date="1979-08-04")
+        self.assertIsNone(chart.stats)
+
+    def testNetwork(self):
+        chart = self.fetch(date="1979-08-04", collect_stats=True)
+        stats = chart.stats
+        self.assertEqual(stats.source, "network")
+        self.assertEqual(stats.entryCount, 100)
+        self.assertEqual(stats.responseBytes, PAGE_BYTES)
+        self.assertEqual(stats.retries, 0)
+        self.assertGreater(stats.treeTime, 0)
+        self.assertGreater(stats.entriesTime, 0)
+        self.assertGreaterEqual(
+            stats.totalTime, stats.requestTime + stats.treeTime + stats.entriesTime
+        )
+        self.assertNotIn("stats", json.loads(chart.json()))
+
+    def testCache(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        cache = billboard.DirectoryChartCache(path)
+        self.fetch(date="1979-08-04", cache=cache)
+        chart = self.fetch(date="1979-08-04", cache=cache, collect_stats=True)
+        self.assertEqual(chart.stats.source, "cache")
+        self.assertEqual(chart.stats.entryCount, 100)
+        self.assertIsNone(chart.stats.requestTime)
+        self.assertIsNone(chart.stats.treeTime)
+
+    def testNotModified(self):
+        billboard.set_default_validator_store(billboard.ValidatorStore())
+        self.addCleanup(
+            billboard.set_default_validator_store, billboard.ValidatorStore()
+        )
+        session = FakeSession(PAGES, etag='"v1"')
+        self.fetch(session=session)
+        chart = self.fetch(session=session, collect_stats=True)
+        self.assertEqual(chart.stats.source, "not-modified")
+        self.assertEqual(chart.stats.responseBytes, 0)
+        self.assertIsNone(chart.stats.treeTime)
+
+    def testObserver(self):
+        observed = []
+
+        def observer(chart, stats):
+            observed.append((chart.date, stats.source))
+
+        billboard.add_stats_observer(observer)
+        try:
+            chart = self.fetch(date="1979-08-04")
+        finally:
+            billboard.remove_stats_observer(observer)
+        self.fetch(date="1979-08-04")
+        self.assertEqual(observed, [("1979-08-04", "network")])
+        self.assertEqual(chart.stats.toDict()["entryCount"], 100)
+
+    def testResponseDetails(self):
+        """Checks that the time until the headers arrived and the retries
+        are taken from the response.
+        """
+        response = FakeResponse("<html></html>")
+        response.elapsed = datetime.timedelta(seconds=0.25)
+        response.raw = types.SimpleNamespace(
+            retries=types.SimpleNamespace(history=["error", "error"])
+        )
+        stats = billboard.FetchStats()
+        stats._recordResponse(response, 1.0)
+        self.assertEqual(stats.requestTime, 0.25)
+        self.assertEqual(stats.downloadTime, 0.75)
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(stats.responseBytes, 13)
+        self.assertIn("retries=2", repr(stats))
+
+    @unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+    def testAsync(self):
+        chart = asyncio.run(
+            billboard.AsyncChartData.fetch(
+                "hot-100",
+                date="1979-08-04",
+                session=FakeAsyncSession(PAGES),
+                collect_stats=True,
+            )
+        )
+        self.assertEqual(chart.stats.source, "network")
+        self.assertEqual(chart.stats.responseBytes, PAGE_BYTES)
+        self.assertEqual(chart.stats.entryCount, 100)
+        self.assertGreater(chart.stats.treeTime, 0)
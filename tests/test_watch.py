@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+
+import requests
+
+import billboard
+from fakes import PublicationSession
+
+
+class ChangingSession(PublicationSession):
+    """Publishes a new chart on each of the given requests (counting from 1),
+    fails the requests listed in `failures`, and serves a page that can't be
+    parsed for those listed in `parseErrors`.
+    """
+
+    def __init__(self, publishOn=(), failures=(), parseErrors=()):
+        super(ChangingSession, self).__init__(
+            "hot-100", "1979-08-04-hot-100.html", ["1979-08-04"]
+        )
+        self.publishOn = publishOn
+        self.failures = failures
+        self.parseErrors = parseErrors
+
+    def get(self, url, timeout=None, **kwargs):
+        requestNumber = len(self.requested) + 1
+        if requestNumber in self.failures:
+            self.requested.append(url)
+            raise requests.exceptions.ConnectionError("no connection")
+        if requestNumber in self.parseErrors:
+            self.requested.append(url)
+            raise billboard.BillboardParseException("Failed to parse title")
+        if requestNumber in self.publishOn:
+            week = 11 + 7 * self.publishOn.index(requestNumber)
+            self.publicationDates.append("1979-08-%02d" % week)
+        return super(ChangingSession, self).get(url, timeout=timeout, **kwargs)
+
+
+class WatchTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(billboard.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sleeps(self):
+        return [round(call[0][0], -1) for call in self.sleep.call_args_list]
+
+    def testNewChart(self):
+        """Checks that an event is yielded only when the date changes."""
+        session = ChangingSession(publishOn=(3,))
+        event = next(billboard.watch("hot-100", session=session))
+        self.assertEqual(event.name, "hot-100")
+        self.assertEqual(event.chart.date, "1979-08-11")
+        self.assertEqual(event.previousDate, "1979-08-04")
+        self.assertEqual(len(event.chart), 100)
+        self.assertEqual(len(session.requested), 3)
+        self.assertEqual(self.sleeps(), [300, 300])
+
+    def testBackoffAfterPublication(self):
+        """Checks that polling slows down until the next chart is due."""
+        session = ChangingSession(publishOn=(2, 4))
+        events = billboard.watch("hot-100", max_interval=1000, session=session)
+        dates = [next(events).chart.date for _ in range(2)]
+        self.assertEqual(dates, ["1979-08-11", "1979-08-18"])
+        self.assertEqual(self.sleeps(), [300, 1000, 1000])
+
+        self.sleep.reset_mock()
+        session = ChangingSession(publishOn=(2, 4))
+        events = billboard.watch("hot-100", period=None, session=session)
+        [next(events) for _ in range(2)]
+        self.assertEqual(self.sleeps(), [300, 300, 300])
+
+    def testKnownDates(self):
+        session = ChangingSession()
+        events = billboard.watch(
+            ["hot-100"], known={"hot-100": "1979-07-28"}, session=session
+        )
+        self.assertEqual(next(events).previousDate, "1979-07-28")
+        self.assertEqual(len(session.requested), 1)
+
+    def testNetworkErrors(self):
+        """Checks that failed polls are retried with exponential backoff."""
+        session = ChangingSession(publishOn=(4,), failures=(2, 3))
+        event = next(billboard.watch("hot-100", interval=10, session=session))
+        self.assertEqual(event.chart.date, "1979-08-11")
+        self.assertEqual(self.sleeps(), [10, 20, 40])
+
+    def testParseErrors(self):
+        """Checks that a poll that can't be parsed doesn't end the watch."""
+        session = ChangingSession(publishOn=(3,), parseErrors=(2,))
+        event = next(billboard.watch("hot-100", interval=10, session=session))
+        self.assertEqual(event.chart.date, "1979-08-11")
+        self.assertEqual(self.sleeps(), [10, 20])
+
+    def testBypassesDefaultCache(self):
+        """Checks that polls aren't answered by the module-wide cache."""
+        cache = billboard.SQLiteChartCache(":memory:")
+        self.addCleanup(cache.close)
+        billboard.set_default_cache(cache)
+        self.addCleanup(billboard.set_default_cache, None)
+        # Stop a watch that keeps being given the cached chart
+        self.sleep.side_effect = lambda seconds: self.assertLess(
+            self.sleep.call_count, 10
+        )
+        session = ChangingSession(publishOn=(2,))
+        event = next(billboard.watch("hot-100", session=session))
+        self.assertEqual(event.chart.date, "1979-08-11")
+        self.assertEqual(len(session.requested), 2)
+        self.assertEqual(cache.hits + cache.misses, 0)